@@ -19,10 +19,23 @@ class LogLevel(str, Enum):
     DEBUG = "debug"
 
 
+LOG_LEVELS = {
+    LogLevel.CRITICAL: logging.CRITICAL,
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.WARN: logging.WARNING,
+    LogLevel.INFO: logging.INFO,
+    LogLevel.DEBUG: logging.DEBUG,
+}
+
+
 def logger(name: Optional[str] = LOG_CLASS) -> logging.Logger:
     return logging.getLogger(name=name)
 
 
 def init_logging(level: LogLevel, name: Optional[str] = LOG_CLASS):
     logging.basicConfig(format=LOG_FORMAT, datefmt=LOG_DATE_FMT)
-    logger(name).setLevel(level.upper())
+    value = LOG_LEVELS.get(level)
+    if value is None:
+        # allow other level names understood by logging (e.g. "WARNING")
+        value = level.upper()
+    logger(name).setLevel(value)
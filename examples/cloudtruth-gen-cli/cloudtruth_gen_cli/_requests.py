@@ -7,20 +7,35 @@
 Uses standard Python requests module, but provids a unfied interface with consistent
 logging, etc.
 """
+import codecs
 import importlib.metadata
 import json
+import logging
+import threading
+import time
 from copy import deepcopy
 from dataclasses import dataclass
-from datetime import datetime
-from datetime import timedelta
+from operator import methodcaller
 from typing import Any
 from typing import Optional
+from urllib.parse import urlencode
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+from requests.utils import guess_json_utf
+from urllib3.util.retry import Retry
 
 from cloudtruth_gen_cli._logging import logger
 
+try:
+    # NOTE: orjson is an optional (faster) JSON parser (see the 'orjson' extra) -- fallback to requests when missing
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _json_loads = None
+
 GET = "GET"
 EXTENSION_MAP = {
     "application/java-archive": "jar",
@@ -62,8 +77,33 @@ EXTENSION_MAP = {
     "application/vnd.mozilla.xul+xml": "xml",
 }
 
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+DEFAULT_TIMEOUT = (5, 30)  # connect, read
+RETRY_METHODS = frozenset([GET, "HEAD"])
+RETRY_STATUSES = (502, 503, 504)
+
 logger = logger()
 
+_strip_slash = methodcaller("strip", "/")
+
+
+def _user_agent() -> str:
+    """Get the User-Agent value using the package name and version."""
+    module_name = __name__.rsplit(".", 3)[0]
+    try:
+        module_version = importlib.metadata.version(module_name)
+    except importlib.metadata.PackageNotFoundError:
+        module_version = "unknown"
+    return f"{module_name}/{module_version}"
+
+
+# NOTE: the version lookup walks the installed package metadata, so only do it once
+_USER_AGENT = _user_agent()
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
 
 @dataclass
 class PageParams:
@@ -92,6 +132,62 @@ class PageParams:
     next_property_name: Optional[str] = None
 
 
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout when none is provided.
+
+    Without a timeout, a dead (pooled) connection can block forever.
+    """
+
+    def __init__(self, *args, timeout: Any = DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """Send the request using the default timeout, if not specified."""
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _get_session() -> requests.Session:
+    """Get the shared session, creating it on first use.
+
+    Using a single session allows the underlying connections to be re-used across requests,
+    instead of doing a new TCP/TLS handshake for every request.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                # only retry idempotent requests, and return the last response when retries are exhausted
+                retries = Retry(
+                    total=2,
+                    backoff_factor=0.2,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=RETRY_METHODS,
+                    raise_on_status=False,
+                )
+                adapter = _TimeoutHTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=retries,
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def close_session() -> None:
+    """Close the shared session (if any) and release the pooled connections."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+
 def create_url(host_or_base_url: str, *args) -> str:
     """Create a URL from the arguements.
 
@@ -103,9 +199,10 @@ def create_url(host_or_base_url: str, *args) -> str:
     if "://" not in host_or_base_url:
         host_or_base_url = "https://" + host_or_base_url.strip("/")
 
-    host_or_base_url = host_or_base_url.rstrip("/")
-    parts = [str(x).strip("/") for x in args]
-    return "/".join([host_or_base_url] + parts) + "/"
+    parts = [host_or_base_url.rstrip("/")]
+    parts.extend(map(_strip_slash, map(str, args)))
+    parts.append("")
+    return "/".join(parts)
 
 
 def request_headers(
@@ -117,11 +214,7 @@ def request_headers(
 
     The API Key and content type are optional, but likely desired.
     """
-    module_name = __name__.rsplit(".", 3)[0]
-    module_version = importlib.metadata.version(module_name)
-    headers = {
-        "User-Agent": f"{module_name}/{module_version}"
-    }
+    headers = {"User-Agent": _USER_AGENT}
     if kwargs:
         headers.update(**kwargs)
     if api_key:
@@ -131,6 +224,24 @@ def request_headers(
     return headers
 
 
+def _response_json(response: requests.Response) -> Any:
+    """Decode the JSON response body.
+
+    UTF-8 bodies are decoded straight from the bytes by orjson (when installed), and anything else is left
+    to requests, which handles the charset.
+    """
+    if _json_loads is not None:
+        encoding = response.encoding or guess_json_utf(response.content)
+        try:
+            is_utf8 = encoding is not None and codecs.lookup(encoding).name == "utf-8"
+        except LookupError:
+            is_utf8 = False
+        if is_utf8:
+            return _json_loads(response.content)
+
+    return response.json()
+
+
 def raise_for_error(response: requests.Response) -> None:
     """Raise an exception for a bad response.
 
@@ -140,13 +251,19 @@ def raise_for_error(response: requests.Response) -> None:
         return
 
     message = f"{response.reason} ({response.status_code})"
+    content_type = response.headers.get("Content-type", "application/json")
+    if not response.content or "json" not in content_type:
+        # no need to attempt decoding empty or non-JSON (e.g. HTML or plain-text) error bodies
+        raise requests.HTTPError(message, response=response)
+
     try:
-        details = response.json()
+        details = _response_json(response)
         if details:
             if isinstance(details, dict):
-                details = "; ".join(f"{k}: {v}" for k, v in details.items())
+                details = "; ".join(["%s: %s" % kv for kv in details.items()])
             message += f": {details}"
-            logger.info(f"{response.request.method} {response.request.url} body:\n{details}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%s %s body:\n%s", response.request.method, response.request.url, details)
     except json.JSONDecodeError:
         pass
 
@@ -157,7 +274,23 @@ def _pretty_params(params: Optional[dict[str, Any]]) -> str:
     if not params:
         return ""
 
-    return "?" + "&".join(f"{k}={v}" for k, v in params.items())
+    return "?" + urlencode(params, doseq=True)
+
+
+class _PrettyUrl:
+    """Defers creating the URL with query parameters until it is used in a log message."""
+
+    __slots__ = ("url", "params", "_text")
+
+    def __init__(self, url: str, params: Optional[dict[str, Any]]):
+        self.url = url
+        self.params = params
+        self._text = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self.url + _pretty_params(self.params)
+        return self._text
 
 
 def request(
@@ -170,14 +303,16 @@ def request(
     **kwargs,  # allows passing through additional named parameters
 ) -> Any:
     """Perform the specified REST request."""
-    headers = headers or {}
-    params = params or {}
-    pretty_url = url + _pretty_params(params)
-    logger.debug(f"Requesting {method} {pretty_url}")
-    start = datetime.now()
-    response = requests.request(method, url, params=params, headers=headers, json=body, timeout=timeout, **kwargs)
-    delta = datetime.now() - start
-    logger.info(f"Got {response.status_code} response from {method} {pretty_url} in {delta.total_seconds()}")
+    # NOTE: headers/params are passed through as-is, since requests handles None
+    # NOTE: the "pretty" URL is only built when it gets logged
+    pretty_url = _PrettyUrl(url, params)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Requesting %s %s", method, pretty_url)
+    start = time.perf_counter()
+    response = _get_session().request(method, url, params=params, headers=headers, json=body, timeout=timeout, **kwargs)
+    if logger.isEnabledFor(logging.INFO):
+        elapsed = time.perf_counter() - start
+        logger.info("Got %s response from %s %s in %s", response.status_code, method, pretty_url, elapsed)
 
     raise_for_error(response)
 
@@ -188,9 +323,9 @@ def request(
     content_type = response.headers.get("Content-type", "application/json")
     if content_type == "application/json":
         try:
-            return response.json()
+            return _response_json(response)
         except json.JSONDecodeError:
-            logger.error(f"Failed to decode {method} {pretty_url} response")
+            logger.error("Failed to decode %s %s response", method, pretty_url)
             return None
 
     if content_type == "application/yaml":
@@ -198,7 +333,7 @@ def request(
             content = response.content.decode(encoding=encoding, errors="ignore")
             return yaml.safe_load(content)
         except Exception as ex:
-            logger.error(f"Failed to decode {method} {pretty_url} response: {ex}")
+            logger.error("Failed to decode %s %s response: %s", method, pretty_url, ex)
             return None
 
     if content_type == "text/plain":
@@ -211,7 +346,7 @@ def request(
             fp.write(response.content)
         return f"Wrote content to {filename}"
 
-    logger.error(f"Unhandled content-type={content_type}")
+    logger.error("Unhandled content-type=%s", content_type)
     return None
 
 
@@ -224,7 +359,7 @@ def depaginate(
 ) -> Any:
     """Get a list of items that may be chunked across several pages."""
     items = []
-    total_time = timedelta()
+    total_time = 0.0
     _url = url
     _params = deepcopy(params or {})
     _headers = deepcopy(headers or {})
@@ -253,15 +388,16 @@ def depaginate(
         if pretty_url != _url:
             pretty_url = _url + _pretty_params(_params)
 
-        logger.debug(f"Requesting {GET} {pretty_url} count={page_count + 1}")
-        start = datetime.now()
-        response = requests.get(_url, params=deepcopy(_params), headers=_headers, timeout=timeout)
-        delta = datetime.now() - start
+        logger.debug("Requesting %s %s count=%d", GET, pretty_url, page_count + 1)
+        start = time.perf_counter()
+        response = _get_session().get(_url, params=deepcopy(_params), headers=_headers, timeout=timeout)
+        elapsed = time.perf_counter() - start
 
         raise_for_error(response)
 
         # update list with current items from the response
-        current = response.json()
+        body = _response_json(response)
+        current = body
         if page_params.items_property_name:
             current = current.get(page_params.items_property_name)
         items.extend(current)
@@ -271,17 +407,17 @@ def depaginate(
             _url = response.headers.get(page_params.next_header_name)
             pretty_url = _url
         elif page_params.next_property_name:
-            _url = response.json().get(page_params.next_property_name)
+            _url = body.get(page_params.next_property_name)
             pretty_url = _url
         else:
             pretty_url = None
 
         # some book-keeping
         curr_len = len(current)
-        total_time += delta
+        total_time += elapsed
         page_count += 1
         item_count += curr_len
-        logger.debug(f"Got {curr_len} items in {delta.total_seconds()}")
+        logger.debug("Got %d items in %s", curr_len, elapsed)
 
         if curr_len == 0:
             # no items provided (even when no page size or max count)
@@ -293,5 +429,5 @@ def depaginate(
             # reached max items
             break
 
-    logger.info(f"Got {len(items)} items using {page_count} requests in {total_time.total_seconds()}")
+    logger.info("Got %d items using %d requests in %s", len(items), page_count, total_time)
     return items
@@ -3,7 +3,9 @@
 # This code was generated by the openapi-spec-tools CLI generator, DO NOT EDIT
 #
 import dataclasses
+import sys
 from enum import Enum
+from typing import Any
 from typing import Optional
 
 import yaml
@@ -14,6 +16,9 @@ from github_gen_cli._console import console_factory
 
 INDENT = "  "
 
+# NOTE: slots are only supported for dataclasses in Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class TreeDisplay(str, Enum):
     HELP = "help"
@@ -37,7 +42,7 @@ class TreeField(str, Enum):
     MODULE = "module"
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(**DATACLASS_SLOTS)
 class TreeNode:
     """Represention of the relationship between the CLI and OAS.
 
@@ -54,15 +59,29 @@ class TreeNode:
     children: list["TreeNode"] = dataclasses.field(default_factory=list)
 
     def get(self, display: TreeDisplay) -> str:
-        if display == TreeDisplay.HELP:
-            return self.help or ''
-        if display == TreeDisplay.FUNCTION:
-            return self.function or ''
-        if display == TreeDisplay.OPERATION:
-            return self.operation or ''
-        if display == TreeDisplay.PATH:
-            return f"{self.method.upper():6} {self.path}" if self.path else ''
-        return None
+        getter = _NODE_GETTERS.get(display)
+        return getter(self) if getter else None
+
+
+def _get_path(node: TreeNode) -> str:
+    return f"{node.method.upper():6} {node.path}" if node.path else ''
+
+
+# maps the display option to the function for getting the node value
+_NODE_GETTERS = {
+    TreeDisplay.HELP: lambda node: node.help or '',
+    TreeDisplay.FUNCTION: lambda node: node.function or '',
+    TreeDisplay.OPERATION: lambda node: node.operation or '',
+    TreeDisplay.PATH: _get_path,
+}
+
+
+# properties (and labels) shown in the inner node table
+NODE_TABLE_DISPLAYS = tuple(
+    (display, display.value)
+    for display in (TreeDisplay.HELP, TreeDisplay.OPERATION, TreeDisplay.PATH, TreeDisplay.FUNCTION)
+)
+DISPLAY_TITLES = {display: display.value.title() for display in TreeDisplay}
 
 
 def parse_tree(identifier: str, command: str, data: dict[str, dict]) -> Optional[TreeNode]:
@@ -112,26 +131,43 @@ def create_node_table(node: TreeNode) -> Table:
     )
     table.add_column("Property", justify="left", no_wrap=True, overflow="ignore")
     table.add_column("Value", justify="left", no_wrap=True, overflow="ignore")
-    for display in [TreeDisplay.HELP, TreeDisplay.OPERATION, TreeDisplay.PATH, TreeDisplay.FUNCTION]:
+    for display, label in NODE_TABLE_DISPLAYS:
         value = node.get(display)
         if value:
-            table.add_row(display.value, value)
+            table.add_row(label, value)
 
     return table
 
 
-def add_node_to_table(table: Table, node: TreeNode, display: TreeDisplay, depth: int, max_depth: int) -> None:
-    """Add a node (with children) to the table."""
-    indent = INDENT * depth
+def tree_rows(nodes: list[TreeNode], display: TreeDisplay, depth: int, max_depth: int) -> list[tuple[str, Any]]:
+    """Get the (name, content) rows for the nodes (with children).
+
+    Walks the tree using a stack (instead of recursion), so the children are pushed in reverse order
+    to keep them in order in the table.
+    """
+    # the display is the same for every node, so pick how the content is rendered up front
     if display != TreeDisplay.ALL:
-        content = node.get(display)
+        def render(n: TreeNode) -> str:
+            return n.get(display)
     else:
-        content = create_node_table(node)
+        render = create_node_table
+
+    rows = []
+    stack = [(n, depth) for n in reversed(nodes)]
+    while stack:
+        current, level = stack.pop()
+        rows.append((INDENT * level + current.name, render(current)))
+        if max_depth > level:
+            stack.extend((child, level + 1) for child in reversed(current.children))
 
-    table.add_row(indent + node.name, content)
-    if max_depth > depth:
-        for child in node.children:
-            add_node_to_table(table, child, display, depth + 1, max_depth)
+    return rows
+
+
+def add_node_to_table(table: Table, node: TreeNode, display: TreeDisplay, depth: int, max_depth: int) -> None:
+    """Add a node (with children) to the table."""
+    add_row = table.add_row
+    for name, content in tree_rows([node], display, depth, max_depth):
+        add_row(name, content)
 
 
 def create_tree_table(node: TreeNode, display: TreeDisplay, max_depth: int) -> Table:
@@ -154,7 +190,7 @@ def create_tree_table(node: TreeNode, display: TreeDisplay, max_depth: int) -> T
         padding=(0, 1),
     )
     table.add_column("Command", style="bold cyan", no_wrap=True)
-    table.add_column(display.value.title())
+    table.add_column(DISPLAY_TITLES[display])
     for child in node.children:
         add_node_to_table(table, child, display, 0, max_depth)
 
@@ -10,6 +10,7 @@ import typer
 from requests import HTTPError
 
 from pets_cli._exceptions import MissingRequiredError
+from pets_cli._exceptions import exception_message
 from pets_cli._exceptions import handle_exceptions
 
 
@@ -28,6 +29,23 @@ def test_handle_exceptions(exception, message):
         assert message in mock_stdout.getvalue()
 
 
+class MyHttpError(HTTPError):
+    pass
+
+
+@pytest.mark.parametrize(
+    ["exception", "message"],
+    [
+        pytest.param(ValueError("My party"), "My party", id="ValueError"),
+        pytest.param(HTTPError("bogus"), "bogus", id="HTTPError"),
+        pytest.param(HTTPError(), "", id="HTTPError-no-args"),
+        pytest.param(MyHttpError("sub-class", "extra"), "sub-class", id="HTTPError-subclass"),
+    ]
+)
+def test_exception_message(exception, message):
+    assert message == exception_message(exception)
+
+
 def test_missing_required():
     items = ["abc", "123"]
     ex = MissingRequiredError(items)
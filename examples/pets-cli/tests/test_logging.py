@@ -28,6 +28,8 @@ def test_get_logger() -> None:
         pytest.param(LogLevel.WARN, logging.WARN, id="warn"),
         pytest.param(LogLevel.INFO, logging.INFO, id="info"),
         pytest.param(LogLevel.DEBUG, logging.DEBUG, id="debug"),
+        pytest.param("info", logging.INFO, id="str-info"),
+        pytest.param("warning", logging.WARNING, id="str-warning"),
     ]
 )
 def test_init_logging(level: LogLevel, expected: int) -> None:
@@ -15,8 +15,14 @@ from requests import HTTPError
 from requests import Request
 from requests import Response
 
+from pets_cli._requests import DEFAULT_TIMEOUT
 from pets_cli._requests import PageParams
+from pets_cli._requests import _get_session
 from pets_cli._requests import _pretty_params
+from pets_cli._requests import _response_json
+from pets_cli._requests import _TimeoutHTTPAdapter
+from pets_cli._requests import _user_agent
+from pets_cli._requests import close_session
 from pets_cli._requests import create_url
 from pets_cli._requests import depaginate
 from pets_cli._requests import raise_for_error
@@ -83,6 +89,50 @@ def test_request_headers(api_key, content_type, kwargs, expected) -> None:
     assert expected == request_headers(api_key, content_type, **kwargs)
 
 
+def test_user_agent_not_installed() -> None:
+    with mock.patch("importlib.metadata.version", side_effect=importlib.metadata.PackageNotFoundError):
+        value = _user_agent()
+    assert value.endswith("/unknown")
+
+
+def test_session_reuse() -> None:
+    close_session()
+    session = _get_session()
+    assert session is _get_session()
+    assert session.get_adapter("http://foo") is session.get_adapter("https://bar")
+
+    close_session()
+    assert session is not _get_session()
+    close_session()
+
+
+def test_session_adapter() -> None:
+    close_session()
+    adapter = _get_session().get_adapter("https://foo")
+    assert DEFAULT_TIMEOUT == adapter.timeout
+    retries = adapter.max_retries
+    assert 2 == retries.total
+    assert {502, 503, 504} == set(retries.status_forcelist)
+    assert {"GET", "HEAD"} == set(retries.allowed_methods)
+    close_session()
+
+
+@pytest.mark.parametrize(
+    ["timeout", "expected"],
+    [
+        pytest.param(None, DEFAULT_TIMEOUT, id="default"),
+        pytest.param(7, 7, id="provided"),
+    ]
+)
+def test_session_adapter_timeout(timeout, expected) -> None:
+    adapter = _TimeoutHTTPAdapter()
+    request = Request("GET", "http://dr.com/abc").prepare()
+    with mock.patch("requests.adapters.HTTPAdapter.send") as mock_send:
+        adapter.send(request, timeout=timeout)
+
+    assert expected == mock_send.call_args.kwargs.get("timeout")
+
+
 @pytest.mark.parametrize(
     ["params", "expected"],
     [
@@ -90,7 +140,8 @@ def test_request_headers(api_key, content_type, kwargs, expected) -> None:
         pytest.param({}, "", id="empty"),
         pytest.param({"a": "B"}, "?a=B", id="simple"),
         pytest.param({"A": "b", "c": "D"}, "?A=b&c=D", id="multiple"),
-        pytest.param({"x y z": 1, "b": True}, "?x y z=1&b=True", id="non-string")
+        pytest.param({"x y z": 1, "b": True}, "?x+y+z=1&b=True", id="non-string"),
+        pytest.param({"a": "b&c=d", "e": ["f", "g"]}, "?a=b%26c%3Dd&e=f&e=g", id="escaped")
     ]
 )
 def test_pretty_params(params, expected) -> None:
@@ -141,6 +192,23 @@ def test_raise_for_error_errors(status_code, reason, body, expected) -> None:
         raise_for_error(response)
 
 
+def log_message(call: Any) -> str:
+    """Get the formatted message from a logger call."""
+    return call.args[0] % call.args[1:]
+
+
+def test_raise_for_error_not_json() -> None:
+    response = Response()
+    response.status_code = 502
+    response.reason = "Bad Gateway"
+    response.request = Request("GET", "http://dr.com/abc").prepare()
+    response.headers.update({"Content-type": "text/html"})
+    response._content = convert_body({"message": "not shown"}, APP_JSON)
+
+    with pytest.raises(HTTPError, match="^Bad Gateway \\(502\\)$"):
+        raise_for_error(response)
+
+
 def success_response(
     method: str = "GET",
     url: str = "http://localhost",
@@ -202,7 +270,8 @@ def test_request(method, content_type, body, params, expected):
 
     prefix = "pets_cli"
     with (
-        mock.patch(f"{prefix}._requests.requests.request") as mock_request,
+        mock.patch(f"{prefix}._requests.requests.Session.request") as mock_request,
+        mock.patch(f"{prefix}._requests.logger.isEnabledFor", return_value=True),
         mock.patch(f"{prefix}._requests.logger.debug") as mock_debug,
         mock.patch(f"{prefix}._requests.logger.info") as mock_info,
         mock.patch(f"{prefix}._requests.raise_for_error") as mock_raise,
@@ -225,17 +294,75 @@ def test_request(method, content_type, body, params, expected):
 
         # check debug log
         assert mock_debug.call_count == 1
-        message = mock_debug.call_args[0][0]
+        message = log_message(mock_debug.call_args)
         assert f"Requesting {method} {url}{_pretty_params(params)}" in message
 
         # check info log
         assert mock_info.call_count == 1
-        message = mock_info.call_args[0][0]
+        message = log_message(mock_info.call_args)
         assert f"Got {response.status_code} response from {method} {url}{_pretty_params(params)}" in message
 
         assert expected == actual
 
 
+@pytest.mark.parametrize("fast_loads", [True, False])
+@pytest.mark.parametrize(
+    ["codec", "encoding"],
+    [
+        pytest.param("utf-8", None, id="utf8-guessed"),
+        pytest.param("utf-8", "UTF-8", id="utf8"),
+        pytest.param("utf-16-le", None, id="utf16-guessed"),
+        pytest.param("utf-16", "utf-16", id="utf16"),
+        pytest.param("latin-1", "ISO-8859-1", id="latin1"),
+    ]
+)
+def test_response_json(codec, encoding, fast_loads) -> None:
+    body = {"name": "caf\u00e9", "count": 2}
+    response = Response()
+    response._content = json.dumps(body, ensure_ascii=False).encode(codec)
+    response.encoding = encoding
+
+    if fast_loads:
+        assert body == _response_json(response)
+    else:
+        with mock.patch("pets_cli._requests._json_loads", None):
+            assert body == _response_json(response)
+
+
+def test_request_no_headers_or_params():
+    url = "https://foo/path"
+    response = success_response(url=url, body={"a": "b"})
+
+    with mock.patch("pets_cli._requests.requests.Session.request") as mock_request:
+        mock_request.return_value = response
+        actual = request("GET", url)
+
+    assert {"a": "b"} == actual
+    req_kwargs = mock_request.call_args.kwargs
+    assert req_kwargs.get("headers") is None
+    assert req_kwargs.get("params") is None
+
+
+def test_request_logging_disabled():
+    url = "https://foo/path"
+    response = success_response(url=url, body={"a": "b"})
+
+    prefix = "pets_cli._requests"
+    with (
+        mock.patch(f"{prefix}.requests.Session.request", return_value=response),
+        mock.patch(f"{prefix}.logger.isEnabledFor", return_value=False),
+        mock.patch(f"{prefix}.logger.debug") as mock_debug,
+        mock.patch(f"{prefix}.logger.info") as mock_info,
+        mock.patch(f"{prefix}._pretty_params") as mock_pretty,
+    ):
+        actual = request("GET", url, params={"c": "d"})
+
+        assert {"a": "b"} == actual
+        assert mock_debug.call_count == 0
+        assert mock_info.call_count == 0
+        assert mock_pretty.call_count == 0
+
+
 ITEMS = [
     {"a": 1, "b": True, "c": "some str", "d": None},
     {"a": 2, "b": False, "c": "", "d": False},
@@ -282,7 +409,7 @@ def test_depaginate_single_success(page_params, resp_body, expected):
     response = success_response(method="GET", url=url, body=resp_body)
 
     with (
-        mock.patch("pets_cli._requests.requests.get", return_value=response) as mock_get,
+        mock.patch("pets_cli._requests.requests.Session.get", return_value=response) as mock_get,
         mock.patch("pets_cli._requests.logger.info") as mock_info,
         mock.patch("pets_cli._requests.logger.debug") as mock_debug,
     ):
@@ -296,14 +423,14 @@ def test_depaginate_single_success(page_params, resp_body, expected):
 
         # look at info logging
         assert 1 == mock_info.call_count
-        imsg = mock_info.call_args[0][0]
+        imsg = log_message(mock_info.call_args)
         assert f"Got {len(items)} items using" in imsg
 
         # look at debug logging
         assert 2 == mock_debug.call_count
-        dmsg = mock_debug.call_args_list[0][0][0]
+        dmsg = log_message(mock_debug.call_args_list[0])
         assert f"Requesting GET {url}" in dmsg
-        dmsg = mock_debug.call_args_list[1][0][0]
+        dmsg = log_message(mock_debug.call_args_list[1])
         assert "items in" in dmsg
 
 
@@ -317,7 +444,7 @@ def test_depagination_next_header():
     page_params = PageParams(next_header_name=next_header)
 
     with (
-        mock.patch("pets_cli._requests.requests.get") as mock_get,
+        mock.patch("pets_cli._requests.requests.Session.get") as mock_get,
         mock.patch("pets_cli._requests.logger.info") as mock_info,
         mock.patch("pets_cli._requests.logger.debug") as mock_debug,
     ):
@@ -334,14 +461,14 @@ def test_depagination_next_header():
 
         # look at info logging
         assert 1 == mock_info.call_count
-        imsg = mock_info.call_args[0][0]
+        imsg = log_message(mock_info.call_args)
         assert f"Got {len(items)} items using" in imsg
 
         # look at debug logging
         assert 4 == mock_debug.call_count
-        dmsg = mock_debug.call_args_list[0][0][0]
+        dmsg = log_message(mock_debug.call_args_list[0])
         assert f"Requesting GET {url}" in dmsg
-        dmsg = mock_debug.call_args_list[2][0][0]
+        dmsg = log_message(mock_debug.call_args_list[2])
         assert f"Requesting GET {next_url}" in dmsg
 
 
@@ -356,7 +483,7 @@ def test_depagination_next_property():
     page_params = PageParams(items_property_name=item_prop, next_property_name=next_prop)
 
     with (
-        mock.patch("pets_cli._requests.requests.get") as mock_get,
+        mock.patch("pets_cli._requests.requests.Session.get") as mock_get,
         mock.patch("pets_cli._requests.logger.info") as mock_info,
         mock.patch("pets_cli._requests.logger.debug") as mock_debug,
     ):
@@ -373,12 +500,12 @@ def test_depagination_next_property():
 
         # look at info logging
         assert 1 == mock_info.call_count
-        imsg = mock_info.call_args[0][0]
+        imsg = log_message(mock_info.call_args)
         assert f"Got {len(items)} items using" in imsg
 
         # look at debug logging
         assert 4 == mock_debug.call_count
-        dmsg = mock_debug.call_args_list[0][0][0]
+        dmsg = log_message(mock_debug.call_args_list[0])
         assert f"Requesting GET {url}" in dmsg
-        dmsg = mock_debug.call_args_list[2][0][0]
+        dmsg = log_message(mock_debug.call_args_list[2])
         assert f"Requesting GET {next_url}" in dmsg
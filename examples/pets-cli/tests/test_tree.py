@@ -9,9 +9,11 @@ from unittest import mock
 
 import pytest
 
+from pets_cli._tree import DATACLASS_SLOTS
 from pets_cli._tree import TreeDisplay
 from pets_cli._tree import TreeNode
 from pets_cli._tree import tree
+from pets_cli._tree import tree_rows
 from tests.helpers import to_ascii
 
 
@@ -34,6 +36,26 @@ def test_tree_node_get():
     assert node.get(TreeDisplay.ALL) is None
 
 
+@pytest.mark.skipif(not DATACLASS_SLOTS, reason="dataclass slots require Python 3.10+")
+def test_tree_node_slots():
+    node = TreeNode(name="slotted")
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.bogus = "value"
+
+
+def test_tree_rows():
+    grandchild = TreeNode(name="gc", help="grand")
+    child = TreeNode(name="c*", help="child", children=[grandchild])
+    sibling = TreeNode(name="s", help="sibling")
+
+    rows = tree_rows([child, sibling], TreeDisplay.HELP, 0, 5)
+    assert [("c*", "child"), ("  gc", "grand"), ("s", "sibling")] == rows
+
+    rows = tree_rows([child, sibling], TreeDisplay.HELP, 0, 0)
+    assert [("c*", "child"), ("s", "sibling")] == rows
+
+
 SAMPLE_TREE = """
 audit:
   description: View CloudTruth audit data
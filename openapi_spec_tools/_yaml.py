@@ -0,0 +1,117 @@
+"""Common YAML loader/dumper selection.
+
+Use the libyaml-backed classes when PyYAML was built with them, since they are much faster than the
+pure-Python implementations.
+"""
+from collections import deque
+from typing import IO
+from typing import Any
+from typing import Optional
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.events import DocumentEndEvent
+from yaml.events import DocumentStartEvent
+from yaml.events import Event
+from yaml.events import MappingEndEvent
+from yaml.events import MappingStartEvent
+from yaml.events import ScalarEvent
+from yaml.events import SequenceEndEvent
+from yaml.events import SequenceStartEvent
+from yaml.events import StreamEndEvent
+from yaml.events import StreamStartEvent
+from yaml.resolver import Resolver
+
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Key used to merge another mapping into a mapping
+MERGE_KEY = "<<"
+
+# The dumpers write to the stream in small pieces, so give files for full specs a larger buffer
+YAML_WRITE_BUFFER = 64 * 1024
+
+
+class _EventLoader(Composer, SafeConstructor, Resolver):
+    """Loader that builds the data from a list of events that were already parsed."""
+
+    def __init__(self, events: list[Event]):
+        self.events = deque(events)
+        Composer.__init__(self)
+        SafeConstructor.__init__(self)
+        Resolver.__init__(self)
+
+    def check_event(self, *choices) -> bool:
+        if not self.events:
+            return False
+        return not choices or isinstance(self.events[0], choices)
+
+    def peek_event(self) -> Event:
+        return self.events[0]
+
+    def get_event(self) -> Event:
+        return self.events.popleft()
+
+
+def _node_events(loader: Any, keep: bool) -> list[Event]:
+    """Read the events for the next node (including any children) -- only kept when requested."""
+    events = []
+    depth = 0
+    while True:
+        event = loader.get_event()
+        if keep:
+            events.append(event)
+        if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return events
+
+
+def load_section(stream: IO[str], key: str, default: Any = None) -> Optional[Any]:
+    """Load only the top-level 'key' value from the YAML document in the stream.
+
+    Only the events for the value are constructed, so the rest of a large document is parsed without
+    building (or resolving) the data. Returns the default when the key is not found.
+
+    Raises a YAMLError when the section cannot be loaded by itself and the full document needs to be
+    loaded instead, e.g. the key is repeated (the last value wins), the top-level uses a merge key, or
+    the stream has multiple documents.
+    """
+    loader = YamlLoader(stream)
+    try:
+        loader.get_event()  # stream start
+        if not loader.check_event(DocumentStartEvent):
+            return default
+        loader.get_event()
+        if not loader.check_event(MappingStartEvent):
+            raise yaml.YAMLError("top-level is not a mapping")
+        loader.get_event()
+
+        value_events = None
+        while not loader.check_event(MappingEndEvent):
+            key_events = _node_events(loader, keep=True)
+            name = key_events[0].value if len(key_events) == 1 and isinstance(key_events[0], ScalarEvent) else None
+            if name == MERGE_KEY:
+                raise yaml.YAMLError("top-level merge key")
+            found = name == key
+            if found and value_events is not None:
+                raise yaml.YAMLError(f"duplicate top-level key: {key}")
+            events = _node_events(loader, keep=found)
+            if found:
+                value_events = events
+
+        loader.get_event()  # mapping end
+        loader.get_event()  # document end
+        if not loader.check_event(StreamEndEvent):
+            raise yaml.YAMLError("multiple documents")
+    finally:
+        loader.dispose()
+
+    if value_events is None:
+        return default
+
+    events = [StreamStartEvent(), DocumentStartEvent(), *value_events, DocumentEndEvent(), StreamEndEvent()]
+    return _EventLoader(events).get_single_data()
@@ -1,10 +1,21 @@
 import os
+from typing import Optional
 
 from rich.console import Console
 
 TEST_TERMINAL_WIDTH = 100
 
 
+def _default_width() -> Optional[int]:
+    """Get the default terminal width from the environment."""
+    width_env = os.environ.get("TERMINAL_WIDTH")
+    if width_env is not None:
+        return int(width_env)
+    if os.environ.get("PYTEST_VERSION") is not None:
+        return TEST_TERMINAL_WIDTH
+    return None
+
+
 def console_factory(*args, **kwargs) -> Console:
     """Create/initialize a Console object.
 
@@ -12,12 +23,6 @@ def console_factory(*args, **kwargs) -> Console:
     when detecting that we're testing use a wide terminal to avoid line wrap issues.
     """
     width = kwargs.pop("width", None)
-    width_env = os.environ.get("TERMINAL_WIDTH")
-    pytest_version = os.environ.get("PYTEST_VERSION")
-    if width is not None:
-        pass
-    elif width_env is not None:
-        width = int(width_env)
-    elif pytest_version is not None:
-        width = TEST_TERMINAL_WIDTH
+    if width is None:
+        width = _default_width()
     return Console(*args, width=width, **kwargs)
@@ -12,12 +12,29 @@ class MissingRequiredError(Exception):
         super().__init__(message)
 
 
+def _http_error_message(ex: HTTPError) -> str:
+    """Get the message without the extra details that the HTTPError adds."""
+    return str(ex.args[0]) if ex.args else str(ex)
+
+
+# maps the exception type to a function that formats the message
+EXCEPTION_FORMATTERS = {
+    HTTPError: _http_error_message,
+}
+
+
+def exception_message(ex: Exception) -> str:
+    """Get a concise message for the exception."""
+    formatter = EXCEPTION_FORMATTERS.get(type(ex))
+    if formatter is None:
+        # fallback to handle sub-classes of the exceptions
+        formatter = next((f for t, f in EXCEPTION_FORMATTERS.items() if isinstance(ex, t)), str)
+    return formatter(ex)
+
+
 def handle_exceptions(ex: Exception) -> None:
     """Process exception and print a more concise error."""
-    if isinstance(ex, HTTPError):
-        message = str(ex.args[0])
-    else:
-        message = str(ex)
+    message = exception_message(ex)
     console = console_factory()
     console.print(f"[red]ERROR:[/red] {message}")
     raise typer.Exit(1)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Implementation of the CLI generation CLI."""
 import os
-from copy import deepcopy
+import sys
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -15,6 +15,8 @@ from rich import print_json
 from rich.console import Console
 from rich.table import Table
 
+from openapi_spec_tools._yaml import YAML_WRITE_BUFFER
+from openapi_spec_tools._yaml import YamlDumper
 from openapi_spec_tools.cli_gen._arguments import LogLevelOption
 from openapi_spec_tools.cli_gen._logging import init_logging
 from openapi_spec_tools.cli_gen._logging import logger
@@ -31,15 +33,13 @@ from openapi_spec_tools.cli_gen.files import generate_tree_node
 from openapi_spec_tools.cli_gen.files import set_copyright
 from openapi_spec_tools.cli_gen.generator import Generator
 from openapi_spec_tools.cli_gen.layout import DEFAULT_START
-from openapi_spec_tools.cli_gen.layout import check_pagination_definitions
 from openapi_spec_tools.cli_gen.layout import file_to_tree
 from openapi_spec_tools.cli_gen.layout import open_layout
-from openapi_spec_tools.cli_gen.layout import operation_duplicates
-from openapi_spec_tools.cli_gen.layout import operation_order
-from openapi_spec_tools.cli_gen.layout import subcommand_missing_properties
 from openapi_spec_tools.cli_gen.layout import subcommand_order
 from openapi_spec_tools.cli_gen.layout import subcommand_references
+from openapi_spec_tools.cli_gen.layout import validate_subcommands
 from openapi_spec_tools.cli_gen.layout_types import LayoutNode
+from openapi_spec_tools.spec_cache import load_oas_cached
 from openapi_spec_tools.types import OasField
 from openapi_spec_tools.utils import open_oas
 from openapi_spec_tools.utils import remove_property
@@ -76,6 +76,26 @@ def open_oas_with_error_handling(filename: str) -> Any:
     raise typer.Exit(1)
 
 
+def load_oas_with_error_handling(filename: str) -> tuple[Any, dict[str, Any]]:
+    """Perform error handling around loading an OpenAPI spec (and operations) from the cache.
+
+    Avoids the standard Typer error handling that is quite verbose.
+    """
+    try:
+        starttime = datetime.now()
+        data = load_oas_cached(filename)
+        delta = datetime.now() - starttime
+        logger(GENERATOR_LOG_CLASS).info(f"Loading {filename} took {delta.total_seconds()} seconds")
+        return data
+    except FileNotFoundError:
+        message = f"failed to find {filename}"
+    except Exception as ex:
+        message = f"unable to parse {filename}: {ex}"
+
+    typer.echo(f"ERROR: {message}")
+    raise typer.Exit(1)
+
+
 def open_layout_with_error_handling(filename: str) -> Any:
     """Perform error handling around opening a layout file.
 
@@ -171,29 +191,29 @@ def layout_check_format(
             typer.echo(f"Sub-commands are misordered:{SEP}{SEP.join(errors)}")
             result = 1
 
-    if missing_props:
-        errors = subcommand_missing_properties(data)
-        if errors:
-            typer.echo(f"Sub-commands have missing properties:{_dict_to_str(errors)}")
-            result = 1
+    # the per sub-command checks are all done in a single pass over the data
+    sub_errors = validate_subcommands(
+        data,
+        missing_props=missing_props,
+        op_dups=op_dups,
+        op_order=op_order,
+        pagination=pagination,
+    )
+    if sub_errors.missing_properties:
+        typer.echo(f"Sub-commands have missing properties:{_dict_to_str(sub_errors.missing_properties)}")
+        result = 1
 
-    if op_dups:
-        errors = operation_duplicates(data)
-        if errors:
-            typer.echo(f"Duplicate operations in sub-commands:{_dict_to_str(errors)}")
-            result = 1
+    if sub_errors.duplicates:
+        typer.echo(f"Duplicate operations in sub-commands:{_dict_to_str(sub_errors.duplicates)}")
+        result = 1
 
-    if op_order:
-        errors = operation_order(data)
-        if errors:
-            typer.echo(f"Sub-command operation orders should be:{_dict_to_str(errors)}")
-            result = 1
+    if sub_errors.order:
+        typer.echo(f"Sub-command operation orders should be:{_dict_to_str(sub_errors.order)}")
+        result = 1
 
-    if pagination:
-        errors = check_pagination_definitions(data)
-        if errors:
-            typer.echo(f"Pagination parameter errors:{_dict_to_str(errors)}")
-            result = 1
+    if sub_errors.pagination:
+        typer.echo(f"Pagination parameter errors:{_dict_to_str(sub_errors.pagination)}")
+        result = 1
 
     if result:
         raise typer.Exit(result)
@@ -226,15 +246,11 @@ def layout_tree(
         return
 
     if style == TreeFormat.YAML:
-        print(yaml.dump(tree.as_dict(), indent=indent, sort_keys=False))
+        # stream directly to stdout rather than building (and printing) the full text
+        yaml.dump(tree.as_dict(), sys.stdout, Dumper=YamlDumper, indent=indent, sort_keys=False)
+        sys.stdout.write("\n")
         return
 
-    def add_node(table: Table, node: LayoutNode, level: int) -> None:
-        name = f"{' ' * indent * level}{node.command}"
-        table.add_row(name, node.identifier, node.description)
-        for child in node.children:
-            add_node(table, child, level + 1)
-
     table = Table(
         highlight=True,
         expand=False,
@@ -246,7 +262,16 @@ def layout_tree(
     for name in headers:
         table.add_column(name, justify="left", no_wrap=True, overflow="ignore")
 
-    add_node(table, tree, 0)
+    # walk the tree depth-first using a stack, with the indent prefixes built once per level
+    indents = [""]
+    pending = [(tree, 0)]
+    while pending:
+        node, level = pending.pop()
+        if level == len(indents):
+            indents.append(indents[-1] + " " * indent)
+        table.add_row(indents[level] + node.command, node.identifier, node.description)
+        pending.extend((child, level + 1) for child in reversed(node.children))
+
     console = Console()
     console.print(table)
     return
@@ -334,13 +359,13 @@ def generate_cli(
             raise typer.Exit(1)
 
     commands = layout_tree_with_error_handling(layout_file, start=start)
-    oas = open_oas_with_error_handling(openapi_file)
+    oas, operations = load_oas_with_error_handling(openapi_file)
 
     if copyright_file:
         text = Path(copyright_file).read_text()
         set_copyright(text)
 
-    missing = check_for_missing(commands, oas)
+    missing = check_for_missing(commands, oas, operations)
     if missing:
         typer.echo(render_missing(missing))
         raise typer.Exit(1)
@@ -378,9 +403,9 @@ def generate_check_missing(
 ) -> None:
     init_logging(log_level, GENERATOR_LOG_CLASS)
     commands = layout_tree_with_error_handling(layout_file, start=start)
-    oas = open_oas_with_error_handling(openapi_file)
+    oas, operations = load_oas_with_error_handling(openapi_file)
 
-    missing = check_for_missing(commands, oas)
+    missing = check_for_missing(commands, oas, operations)
     if missing:
         typer.echo(render_missing(missing))
         raise typer.Exit(1)
@@ -398,9 +423,9 @@ def generate_unreferenced(
 ) -> None:
     init_logging(log_level, GENERATOR_LOG_CLASS)
     commands = layout_tree_with_error_handling(layout_file, start=start)
-    oas = open_oas_with_error_handling(openapi_file)
+    oas, operations = load_oas_with_error_handling(openapi_file)
 
-    unreferenced = find_unreferenced(commands, oas)
+    unreferenced = find_unreferenced(commands, oas, operations)
     if not unreferenced:
         typer.echo("No unreferenced operations found")
         return
@@ -414,9 +439,7 @@ def generate_unreferenced(
             parts = path.split("/")
             path = "/".join([p for p in parts if p and '{' not in p])
 
-        operations = paths.get(path, [])
-        operations.append(op)
-        paths[path] = operations
+        paths.setdefault(path, []).append(op)
 
     # display each operations below the path
     for path, ops in paths.items():
@@ -498,8 +521,8 @@ def trim_oas(
 
     init_logging(log_level, GENERATOR_LOG_CLASS)
     layout = layout_tree_with_error_handling(layout_file, start=start)
-    oas = open_oas_with_error_handling(openapi_file)
-    updated = deepcopy(oas)
+    # NOTE: the update functions are non-destructive (they return modified copies), so no need to copy here
+    updated = open_oas_with_error_handling(openapi_file)
 
     operations = _operations(layout)
     if remove_properties:
@@ -514,7 +537,7 @@ def trim_oas(
         updated = set_nullable_not_required(updated)
 
     out_file = updated_file or openapi_file
-    with open(out_file, "w", encoding="utf-8", newline="\n") as fp:
+    with open(out_file, "w", encoding="utf-8", newline="\n", buffering=YAML_WRITE_BUFFER) as fp:
         yaml.dump(updated, fp, indent=indent, sort_keys=True)
 
     typer.echo(f"Wrote to {out_file}")
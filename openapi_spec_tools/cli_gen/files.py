@@ -3,6 +3,7 @@ import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any
+from typing import Optional
 
 from openapi_spec_tools.cli_gen._logging import logger
 from openapi_spec_tools.cli_gen._tree import TreeField
@@ -59,28 +60,50 @@ def copyright() -> str:
     return _copyright
 
 
-def generate_node(generator: Generator, node: LayoutNode, directory: str) -> None:
-    """Create a file/module for the current node, and recursively goes through sub-commands."""
+def render_module(generator: Generator, node: LayoutNode) -> tuple[str, str, list[LayoutNode]]:
+    """Create the text of the module for the current node.
+
+    Returns the module name, the text, and the sub-commands that need modules.
+    """
     module_name = to_snake_case(node.identifier)
     logger.info(f"Generating {module_name} module")
-    text = generator.shebang()
-    text += copyright()
-    text += generator.standard_imports()
-    text += generator.subcommand_imports(node.subcommands())
-    text += generator.app_definition(node)
-    text += generator.tree_function(node)
-    for command in node.operations():
-        text += generator.function_definition(command)
-    text += generator.main()
-
-    filename = os.path.join(directory, module_name + ".py")
-    with open(filename, "w", encoding="utf-8", newline="\n") as fp:
-        fp.write(text)
-    os.chmod(filename, 0o755)
+    subcommands, operations = node.partition()
+    parts = [
+        generator.shebang(),
+        copyright(),
+        generator.standard_imports(),
+        generator.subcommand_imports(subcommands),
+        generator.app_definition(node),
+        generator.tree_function(node),
+    ]
+    parts.extend(generator.function_definition(command) for command in operations)
+    parts.append(generator.main())
+    return module_name, "".join(parts), subcommands
 
-    # recursively do the same for sub-commands
-    for command in node.subcommands():
-        generate_node(generator, command, directory)
+
+def generate_node(generator: Generator, node: LayoutNode, directory: str) -> None:
+    """Create a file/module for the current node, and all the sub-commands below it.
+
+    Uses an explicit stack (rather than recursion) to walk the layout tree, so the depth is not
+    limited by the interpreter recursion limit. The files are only written once all the modules are
+    rendered, so a failure does not leave a partially updated directory.
+    """
+    modules = {}
+    pending = [node]
+    while pending:
+        module_name, text, subcommands = render_module(generator, pending.pop())
+        if module_name in modules:
+            raise ValueError(f"duplicate module name: {module_name}")
+        modules[module_name] = text
+        # reversed to generate in the same (depth-first) order as the layout
+        pending.extend(reversed(subcommands))
+
+    os.makedirs(directory, exist_ok=True)
+    for module_name, text in modules.items():
+        filename = os.path.join(directory, module_name + ".py")
+        with open(filename, "w", encoding="utf-8", newline="\n") as fp:
+            fp.write(text)
+        os.chmod(filename, 0o755)
 
 
 def generate_tree_node(generator: Generator, node: LayoutNode) -> TreeNode:
@@ -119,45 +142,53 @@ def generate_tree_file(generator: Generator, node: LayoutNode, directory: str) -
         fp.write(generator.get_tree_yaml(node))
 
 
-def check_for_missing(node: LayoutNode, oas: dict[str, Any]) -> dict[str, list[str]]:
-    """Look for operations in node (and children) that are NOT in the OpenAPI spec."""
-    def _check_missing(node: LayoutNode, ops: dict[str, Any]) -> dict[str, list[str]]:
-        current = []
-        for op in node.operations():
-            if op.identifier not in operations:
-                current.append(op.identifier)
-
-        if not current:
-            return {}
-        return {node.identifier: current}
-
-
-    operations = map_operations(oas.get(OasField.PATHS, {}))
-    missing = _check_missing(node, operations)
-
-    # recursively do the same for sub-commands
-    for command in node.subcommands():
-        missing.update(_check_missing(command, operations))
+def check_for_missing(
+    node: LayoutNode,
+    oas: dict[str, Any],
+    operations: Optional[dict[str, Any]] = None,
+) -> dict[str, list[str]]:
+    """Look for operations in node (and all sub-commands below it) that are NOT in the OpenAPI spec.
+
+    The `operations` map (from `map_operations()`) is created from the `oas` when not provided.
+    """
+    if operations is None:
+        operations = map_operations(oas.get(OasField.PATHS, {}))
+
+    missing = {}
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        subcommands, ops = current.partition()
+        absent = [op.identifier for op in ops if op.identifier not in operations]
+        if absent:
+            missing[current.identifier] = absent
+        # reversed to report in the same (depth-first) order as the layout
+        pending.extend(reversed(subcommands))
 
     return missing
 
 
-def find_unreferenced(node: LayoutNode, oas: dict[str, Any]) -> dict[str, Any]:
-    """Find the operations in the OAS that are unrerenced by the commands."""
-    def _find_operations(_node: LayoutNode) -> set[str]:
-        """Recursively finds all the operations for this node and it's children."""
-        current = set()
-        for op in _node.operations(include_bugged=True):
-            current.add(op.identifier)
-        for child in _node.subcommands(include_bugged=True):
-            current.update(_find_operations(child))
-        return current
-
-    referenced = _find_operations(node)
-    ops = map_operations(oas.get(OasField.PATHS))
+def find_unreferenced(
+    node: LayoutNode,
+    oas: dict[str, Any],
+    operations: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """Find the operations in the OAS that are unrerenced by the commands.
+
+    The `operations` map (from `map_operations()`) is created from the `oas` when not provided.
+    """
+    referenced = set()
+    pending = [node]
+    while pending:
+        subcommands, ops = pending.pop().partition(include_bugged=True)
+        referenced.update(op.identifier for op in ops)
+        pending.extend(subcommands)
+
+    if operations is None:
+        operations = map_operations(oas.get(OasField.PATHS, {}))
     unreferenced = {
         op_id: op_data
-        for op_id, op_data in ops.items()
+        for op_id, op_data in operations.items()
         if op_id not in referenced
     }
 
@@ -171,11 +202,11 @@ def copy_and_update(src_filename: str, dst_filename: str, replacements: dict[str
         open(dst_filename, "w", encoding="utf-8", newline="\n") as dst_fp,
     ):
         # NOTE: ignore the shebangs for now... not used to copy over executable files
+        text = src_fp.read()
+        for old, new in replacements.items():
+            text = text.replace(old, new)
         dst_fp.write(copyright())
-        for line in src_fp.readlines():
-            for old, new in replacements.items():
-                line = line.replace(old, new)
-            dst_fp.write(line)
+        dst_fp.write(text)
 
 
 def copy_infrastructure(dst_dir: str, package_name: str):
@@ -860,10 +860,9 @@ if __name__ == "__main__":
             for parents in lineage:
                 prev = "body"
                 for curr in parents:
-                    items = depends.get(prev, [])
+                    items = depends.setdefault(prev, [])
                     if curr not in items:
                         items.append(curr)
-                    depends[prev] = items
                     prev = curr
 
             while depends:
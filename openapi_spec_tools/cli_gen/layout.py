@@ -1,17 +1,38 @@
 """Collection of functions for working the layout files."""
+from collections import defaultdict
 from pathlib import Path
 from typing import Any
+from typing import Callable
 from typing import Optional
 
 import yaml
 
+from openapi_spec_tools._yaml import YamlLoader
 from openapi_spec_tools.cli_gen.layout_types import LayoutField
 from openapi_spec_tools.cli_gen.layout_types import LayoutNode
 from openapi_spec_tools.cli_gen.layout_types import PaginationField
 from openapi_spec_tools.cli_gen.layout_types import PaginationNames
+from openapi_spec_tools.cli_gen.layout_types import SubcommandErrors
 
 DEFAULT_START = "main"
 
+# values of the fields already parsed into the LayoutNode (anything else is "extra")
+LAYOUT_FIELD_VALUES = frozenset(v.value for v in LayoutField)
+
+# plain string values of the LayoutField members used when walking the layout data -- avoids the
+# enum attribute lookups in the (per sub-command/operation) loops
+_BUG_IDS = LayoutField.BUG_IDS.value
+_DESCRIPTION = LayoutField.DESCRIPTION.value
+_NAME = LayoutField.NAME.value
+_OP_ID = LayoutField.OP_ID.value
+_OPERATIONS = LayoutField.OPERATIONS.value
+_PAGINATION = LayoutField.PAGINATION.value
+_SUB_ID = LayoutField.SUB_ID.value
+_SUMMARY_FIELDS = LayoutField.SUMMARY_FIELDS.value
+
+# an item with only these fields is a plain operation that uses all the LayoutNode defaults
+SIMPLE_OPERATION_FIELDS = frozenset((_NAME, _OP_ID))
+
 
 def open_layout(filename: str) -> Any:
     """Open the specified filename, and return the dictionary."""
@@ -20,7 +41,7 @@ def open_layout(filename: str) -> Any:
         raise FileNotFoundError(filename)
 
     with open(filename, "r", encoding="utf-8", newline="\n") as fp:
-        return yaml.safe_load(fp)
+        return yaml.load(fp, Loader=YamlLoader)
 
 
 def field_to_list(data: dict[str, Any], field: str) -> list[str]:
@@ -44,7 +65,7 @@ def parse_extras(data: dict[str, Any]) -> dict[str, Any]:
     return {
         k: v
         for k, v in data.items()
-        if k not in [v.value for v in LayoutField]
+        if k not in LAYOUT_FIELD_VALUES
     }
 
 
@@ -65,27 +86,31 @@ def parse_pagination(data: Optional[dict[str, Any]]) -> Optional[PaginationNames
 
 def data_to_node(data: dict[str, Any], identifier: str, command: str, item: dict[str, Any]) -> LayoutNode:
     """Recursively convert elements from data to LayoutNodes."""
-    description = item.get(LayoutField.DESCRIPTION, "")
+    if item.keys() <= SIMPLE_OPERATION_FIELDS:
+        # short-cut for the most common operation definition
+        return LayoutNode(command=command, identifier=identifier)
+
+    description = item.get(_DESCRIPTION, "")
     # identifier = item.get(LayoutField.OP_ID) or identifier
     # parse bugs and summary fields into a list
-    bugs = field_to_list(item, LayoutField.BUG_IDS)
-    summary_fields = field_to_list(item, LayoutField.SUMMARY_FIELDS)
+    bugs = field_to_list(item, _BUG_IDS)
+    summary_fields = field_to_list(item, _SUMMARY_FIELDS)
     extra = parse_extras(item)
-    pagination = parse_pagination(item.get(LayoutField.PAGINATION))
+    pagination = parse_pagination(item.get(_PAGINATION))
 
     children = []
-    for op_data in item.get(LayoutField.OPERATIONS, []):
-        op_name = op_data.get(LayoutField.NAME)
-        sub_id = op_data.get(LayoutField.SUB_ID)
+    for op_data in item.get(_OPERATIONS, []):
+        op_name = op_data.get(_NAME)
+        sub_id = op_data.get(_SUB_ID)
         if sub_id:
             # recursively go through this
             subcommand = data_to_node(data, sub_id, op_name, data.get(sub_id, {}))
-            subcommand.bugs.extend(field_to_list(op_data, LayoutField.BUG_IDS))
+            subcommand.bugs.extend(field_to_list(op_data, _BUG_IDS))
             children.append(subcommand)
             continue
 
         # use the current op-data to create a node -- it will be short
-        op_id = op_data.get(LayoutField.OP_ID)
+        op_id = op_data.get(_OP_ID)
         children.append(data_to_node(data, op_id, op_name, op_data))
 
     return LayoutNode(
@@ -109,85 +134,91 @@ def parse_to_tree(data: dict[str, Any], start: str = DEFAULT_START) -> LayoutNod
     return data_to_node(data, start, start, top)
 
 
-def subcommand_missing_properties(data: dict[str, Any]) -> dict[str, str]:
-    """Look for missing properties in the sub-commands."""
-    errors = {}
-    for sub_name, sub_data in data.items():
-        sub_data = sub_data or {}
-        missing = []
+def _missing_properties(sub_data: dict[str, Any]) -> Optional[str]:
+    """Look for missing properties in a single sub-command."""
+    missing = []
 
-        # check top-level fields
-        for k in (LayoutField.DESCRIPTION, LayoutField.OPERATIONS):
-            if k not in sub_data:
-                missing.append(k)
+    # check top-level fields
+    for k in (_DESCRIPTION, _OPERATIONS):
+        if k not in sub_data:
+            missing.append(k)
 
-        # check each operations
-        for index, op_data in enumerate(sub_data.get(LayoutField.OPERATIONS, [])):
-            identifier = op_data.get(LayoutField.NAME) or f"operation[{index}]"
-            if LayoutField.NAME not in op_data:
-                missing.append(f"{identifier} {LayoutField.NAME.value}")
-            if LayoutField.OP_ID not in op_data and LayoutField.SUB_ID not in op_data:
-                missing.append(f"{identifier} {LayoutField.OP_ID.value} or {LayoutField.SUB_ID.value}")
+    # check each operations
+    for index, op_data in enumerate(sub_data.get(_OPERATIONS, [])):
+        identifier = op_data.get(_NAME) or f"operation[{index}]"
+        if _NAME not in op_data:
+            missing.append(f"{identifier} {_NAME}")
+        if _OP_ID not in op_data and _SUB_ID not in op_data:
+            missing.append(f"{identifier} {_OP_ID} or {_SUB_ID}")
 
-        if missing:
-            errors[sub_name] = ", ".join(missing)
+    return ", ".join(missing) if missing else None
 
-    return errors
 
+def _duplicates(sub_data: dict[str, Any]) -> Optional[str]:
+    """Look for operations with redundant names in a single sub-command."""
+    values = defaultdict(list)
+    for index, op_data in enumerate(sub_data.get(_OPERATIONS, [])):
+        name = op_data.get(_NAME)
+        if not name:
+            continue
 
-def operation_duplicates(data: dict[str, Any]) -> dict[str, Any]:
-    """Look for command operations with redundant names (within each command)."""
-    errors = {}
+        values[name].append(index)
 
-    for sub_name, sub_data in data.items():
-        # check each operations
-        values = {}
-        sub_data = sub_data or {}
-        for index, op_data in enumerate(sub_data.get(LayoutField.OPERATIONS, [])):
-            name = op_data.get(LayoutField.NAME)
-            if not name:
-                continue
+    multiples = []
+    for name, indices in values.items():
+        if len(indices) > 1:
+            multiples.append(f"{name} at {', '.join(map(str, indices))}")
 
-            indices = values.get(name, [])
-            values[name] = indices + [index]
+    return "; ".join(sorted(multiples)) if multiples else None
 
-        multiples = []
-        for name, indices in values.items():
-            if len(indices) > 1:
-                multiples.append(f"{name} at {', '.join([str(x) for x in indices])}")
 
-        if multiples:
-            errors[sub_name] = "; ".join(sorted(multiples))
+def _misordered(sub_data: dict[str, Any]) -> Optional[str]:
+    """Check the operations order of a single sub-command."""
+    op_names = [op.get(_NAME) for op in sub_data.get(_OPERATIONS, [])]
+    # NOTE: itertools.pairwise() is not available in Python 3.9
+    if all(op_names[i] <= op_names[i + 1] for i in range(len(op_names) - 1)):
+        return None
+
+    return ", ".join(sorted(op_names))
 
-    return errors
+
+def subcommand_missing_properties(data: dict[str, Any]) -> dict[str, str]:
+    """Look for missing properties in the sub-commands."""
+    return _collect_errors(data, _missing_properties)
+
+
+def operation_duplicates(data: dict[str, Any]) -> dict[str, Any]:
+    """Look for command operations with redundant names (within each command)."""
+    return _collect_errors(data, _duplicates)
 
 
 def operation_order(data: dict[str, Any]) -> dict[str, Any]:
     """Check the operations order for each subcommand."""
-    errors = {}
+    return _collect_errors(data, _misordered)
+
 
+def _collect_errors(data: dict[str, Any], check: Callable[[dict[str, Any]], Optional[str]]) -> dict[str, str]:
+    """Run the check against each sub-command, and gather the errors by sub-command name."""
+    errors = {}
     for sub_name, sub_data in data.items():
-        sub_data = sub_data or {}
-        op_names = [op.get(LayoutField.NAME) for op in sub_data.get(LayoutField.OPERATIONS, [])]
-        if op_names != sorted(op_names):
-            errors[sub_name] = ", ".join(sorted(op_names))
+        error = check(sub_data or {})
+        if error:
+            errors[sub_name] = error
 
     return errors
 
 
 def subcommand_references(data: dict[str, Any], start: str = DEFAULT_START) -> tuple[set[str], set[str]]:
     """Find missing and unused subcommand refeferences."""
-    referenced = set()
-    for sub_data in data.values():
-        sub_data = sub_data or {}
-        refs = [
-            op.get(LayoutField.SUB_ID)
-            for op in sub_data.get(LayoutField.OPERATIONS, [])
-            if op.get(LayoutField.SUB_ID)
-        ]
-        referenced.update(refs)
-
-    names = set(data.keys())
+    referenced = {
+        op.get(_SUB_ID)
+        for sub_data in data.values()
+        if sub_data
+        for op in sub_data.get(_OPERATIONS, [])
+        if op.get(_SUB_ID)
+    }
+
+    names = data.keys()
     unused = names - referenced - {start}
     missing = referenced - names
 
@@ -222,33 +253,69 @@ def subcommand_order(data: dict[str, Any], start: str = DEFAULT_START) -> list[s
     return misordered
 
 
+def _pagination_errors(sub_name: str, sub_data: dict[str, Any]) -> dict[str, str]:
+    """Check the pagination parameters of the operations in a single sub-command."""
+    errors = {}
+    for op in sub_data.get(_OPERATIONS, []):
+        page_params = op.get(_PAGINATION)
+        if not page_params:
+            continue
+
+        reasons = []
+
+        extra_keys = [k for k in page_params.keys() if not PaginationField.contains(k)]
+        if extra_keys:
+            reasons.append(f"unsupported parameters: {', '.join(extra_keys)}")
+        if page_params.get(PaginationField.NEXT_HEADER) and page_params.get(PaginationField.NEXT_PROP):
+            reasons.append("cannot have next URL in both header and body property")
+        if page_params.get(PaginationField.ITEM_START) and page_params.get(PaginationField.PAGE_START):
+            reasons.append("start can only be specified with page or item paramter")
+
+        if reasons:
+            full_name = f"{sub_name}.{op.get(_NAME)}"
+            errors[full_name] = '; '.join(reasons)
+
+    return errors
+
+
 def check_pagination_definitions(data: dict[str, Any]) -> dict[str, str]:
     """Check for issues with the pagnination parameters that would potentially cause confusion."""
     errors = {}
-
     for sub_name, sub_data in data.items():
-        sub_data = sub_data or {}
-        for op in sub_data.get(LayoutField.OPERATIONS, []):
-            page_params = op.get(LayoutField.PAGINATION)
-            if not page_params:
-                continue
+        errors.update(_pagination_errors(sub_name, sub_data or {}))
+
+    return errors
 
-            reasons = []
 
-            extra_keys = [k for k in page_params.keys() if not PaginationField.contains(k)]
-            if extra_keys:
-                reasons.append(f"unsupported parameters: {', '.join(extra_keys)}")
-            if page_params.get(PaginationField.NEXT_HEADER) and page_params.get(PaginationField.NEXT_PROP):
-                reasons.append("cannot have next URL in both header and body property")
-            if page_params.get(PaginationField.ITEM_START) and page_params.get(PaginationField.PAGE_START):
-                reasons.append("start can only be specified with page or item paramter")
+def validate_subcommands(
+    data: dict[str, Any],
+    missing_props: bool = True,
+    op_dups: bool = True,
+    op_order: bool = True,
+    pagination: bool = True,
+) -> SubcommandErrors:
+    """Run the requested sub-command checks in a single pass over the layout data.
 
-            if reasons:
-                full_name = f"{sub_name}.{op.get(LayoutField.NAME)}"
-                errors[full_name] = '; '.join(reasons)
+    Provides the same results as `subcommand_missing_properties()`, `operation_duplicates()`,
+    `operation_order()`, and `check_pagination_definitions()` without walking the data for each one.
+    """
+    errors = SubcommandErrors()
+    for sub_name, sub_data in data.items():
+        sub_data = sub_data or {}
+        for enabled, check, found in (
+            (missing_props, _missing_properties, errors.missing_properties),
+            (op_dups, _duplicates, errors.duplicates),
+            (op_order, _misordered, errors.order),
+        ):
+            error = check(sub_data) if enabled else None
+            if error:
+                found[sub_name] = error
+        if pagination:
+            errors.pagination.update(_pagination_errors(sub_name, sub_data))
 
     return errors
 
+
 def file_to_tree(filename: str, start: str = DEFAULT_START) -> LayoutNode:
     """Open filename and parse to a LayoutNode tree."""
     data = open_layout(filename)
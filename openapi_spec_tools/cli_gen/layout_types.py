@@ -4,6 +4,8 @@ from enum import Enum
 from typing import Any
 from typing import Optional
 
+from openapi_spec_tools.cli_gen._tree import DATACLASS_SLOTS
+
 
 class LayoutField(str, Enum):
     """Field names in the layout file, mostly inside the operations section."""
@@ -41,7 +43,7 @@ class PaginationField(str, Enum):
             return False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(**DATACLASS_SLOTS)
 class PaginationNames:
     """Data structure for holding info related to pagination parameters."""
 
@@ -63,6 +65,16 @@ class PaginationNames:
 
 
 @dataclasses.dataclass
+class SubcommandErrors:
+    """Errors found in the layout sub-commands, each keyed by the sub-command (or operation) name."""
+
+    missing_properties: dict[str, str] = dataclasses.field(default_factory=dict)
+    duplicates: dict[str, str] = dataclasses.field(default_factory=dict)
+    order: dict[str, str] = dataclasses.field(default_factory=dict)
+    pagination: dict[str, str] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass(**DATACLASS_SLOTS)
 class LayoutNode:
     """Info for handling the layout file in a hierachical fashion."""
 
@@ -76,12 +88,28 @@ class LayoutNode:
     pagination: Optional[PaginationNames] = None
 
     def as_dict(self, sparse: bool = True) -> dict[str, Any]:
-        """Convert object to dictionary."""
-        def filter_empty_or_none(d: list[tuple[str, Any]]) -> dict[str, Any]:
-            """Skip keys whose value is None, or an empty list/dict/set."""
-            return {k: v for (k, v) in d if v is not None and v != [] and v != {}}
+        """Convert object to dictionary.
 
-        return dataclasses.asdict(self, dict_factory=filter_empty_or_none if sparse else None)
+        When sparse, the keys whose value is None, or an empty list/dict are skipped.
+        """
+        def include(v: Any) -> bool:
+            return not sparse or (v is not None and v != [] and v != {})
+
+        pagination = None
+        if self.pagination is not None:
+            pagination = {k: v for k, v in dataclasses.asdict(self.pagination).items() if include(v)}
+
+        items = (
+            ("command", self.command),
+            ("identifier", self.identifier),
+            ("description", self.description),
+            ("bugs", list(self.bugs)),
+            ("summary_fields", list(self.summary_fields)),
+            ("extra", dict(self.extra)),
+            ("children", [child.as_dict(sparse) for child in self.children]),
+            ("pagination", pagination),
+        )
+        return {k: v for k, v in items if include(v)}
 
     def subcommands(self, include_bugged: bool = False) -> list["LayoutNode"]:
         """List of LayoutNodes that have children."""
@@ -91,6 +119,22 @@ class LayoutNode:
         """List of LayoutNodes without any children."""
         return [n for n in self.children if not n.children and (include_bugged or not n.bugs)]
 
+    def partition(self, include_bugged: bool = False) -> tuple[list["LayoutNode"], list["LayoutNode"]]:
+        """Split the children into sub-commands and operations in a single pass.
+
+        Equivalent to `(self.subcommands(), self.operations())`, but only walks the children once.
+        """
+        subcommands = []
+        operations = []
+        for n in self.children:
+            if not include_bugged and n.bugs:
+                continue
+            if n.children:
+                subcommands.append(n)
+            else:
+                operations.append(n)
+        return subcommands, operations
+
     def find(self, *args) -> Optional["LayoutNode"]:
         """Search for the provided commands."""
         for child in self.children:
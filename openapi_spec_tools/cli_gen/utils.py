@@ -1,5 +1,6 @@
 """Implement some basic utilities used in code generation."""
 import re
+from functools import lru_cache
 from typing import Any
 
 SIMPLE_TRANSLATIONS = str.maketrans(
@@ -17,18 +18,23 @@ SPECIAL_CHARS = [
     # parenthesis/brackets
     '(', ')', '{', '}', '[', ']',
 ]
+SNAKE_ACRONYM_REGEX = re.compile(r"([A-Z]+)([A-Z][a-z])")
+SNAKE_WORD_REGEX = re.compile(r"([a-z0-9])([A-Z])")
+CAMEL_REGEX = re.compile(r"_([a-z])")
 
 
+@lru_cache(maxsize=4096)
 def to_snake_case(text: str) -> str:
     """Convert provided text to a_snake_case value."""
-    text = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1_\2", text)
-    text = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", text)
+    text = SNAKE_ACRONYM_REGEX.sub(r"\1_\2", text)
+    text = SNAKE_WORD_REGEX.sub(r"\1_\2", text)
     return text.lower()
 
 
+@lru_cache(maxsize=4096)
 def to_camel_case(text: str) -> str:
     """Convert provided text to aCamelCase value."""
-    return re.sub(r'_([a-z])', lambda match: match.group(1).upper(), text)
+    return CAMEL_REGEX.sub(lambda match: match.group(1).upper(), text)
 
 
 def maybe_quoted(item: Any) -> str:
@@ -1,39 +1,54 @@
 #!/usr/bin/env python3
 """Implement the 'oas' CLI with options for analyzing and modifying OpenAPI specs."""
+import heapq
+import json
 import os
-from copy import deepcopy
+import sys
+from collections import Counter
 from enum import Enum
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Annotated
 from typing import Any
+from typing import Callable
+from typing import Iterable
 from typing import Optional
 
 import typer
 import yaml
-from rich.console import Console
 
 from openapi_spec_tools._typer import OasFilenameArgument
 from openapi_spec_tools._typer import error_out
+from openapi_spec_tools._yaml import YAML_WRITE_BUFFER
+from openapi_spec_tools._yaml import YamlDumper
+from openapi_spec_tools.spec_cache import load_model_references_cached
+from openapi_spec_tools.spec_cache import load_oas_cached
+from openapi_spec_tools.spec_cache import load_tags_cached
 from openapi_spec_tools.types import OasField
+from openapi_spec_tools.utils import OPERATION_METHODS
 from openapi_spec_tools.utils import count_values
 from openapi_spec_tools.utils import find_diffs
 from openapi_spec_tools.utils import find_paths
 from openapi_spec_tools.utils import find_references
 from openapi_spec_tools.utils import map_content_types
 from openapi_spec_tools.utils import map_models
-from openapi_spec_tools.utils import map_operations
+from openapi_spec_tools.utils import map_tags
 from openapi_spec_tools.utils import model_filter
 from openapi_spec_tools.utils import model_full_name
-from openapi_spec_tools.utils import model_references
 from openapi_spec_tools.utils import models_referenced_by
-from openapi_spec_tools.utils import open_oas
+from openapi_spec_tools.utils import open_oas_section
 from openapi_spec_tools.utils import remove_property
 from openapi_spec_tools.utils import remove_schema_tags
+from openapi_spec_tools.utils import reverse_references
 from openapi_spec_tools.utils import schema_operations_filter
 from openapi_spec_tools.utils import set_nullable_not_required
 from openapi_spec_tools.utils import unmap_models
 from openapi_spec_tools.utils import unroll
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
 INDENT = "    "
 
 
@@ -42,19 +57,52 @@ def short_filename(long: str) -> str:
     return Path(long).name
 
 
-def console_factory() -> Console:
+def console_factory() -> "Console":
     """Consolidate creation/initialization of Console.
 
     A little hacky here... Allow terminal width to be set directly by an environment variable, or
     when detecting that we're testing use a wide terminal to avoid line wrap issues.
+
+    The rich console is imported here, so commands that never print (or just show help) do not pay
+    for importing it. Highlighting is disabled since the output is plain names/counts, and the
+    highlighter runs several regular expressions over every line printed.
     """
+    from rich.console import Console
+
     width = os.environ.get("TERMINAL_WIDTH")
     pytest_version = os.environ.get("PYTEST_VERSION")
     if width is not None:
         width = int(width)
     elif pytest_version is not None:
         width = 3000
-    return Console(width=width)
+    return Console(width=width, highlight=False)
+
+
+def print_yaml(data: Any, indent: int = len(INDENT)) -> None:
+    """Write the data as YAML directly to stdout.
+
+    Streams the YAML instead of building the full text, and bypasses the rich console which
+    would otherwise interpret brackets as markup and wrap long lines.
+    """
+    yaml.dump(data, sys.stdout, Dumper=YamlDumper, indent=indent)
+    sys.stdout.write("\n")
+
+
+def sorted_matches(names: Iterable[str], search: Optional[str] = None) -> list[str]:
+    """Get the sorted list of names that contain the search value (case-insensitive).
+
+    Filters before sorting, so only the matching names get sorted.
+    """
+    if not search:
+        return sorted(names)
+
+    needle = search.lower()
+    return sorted(n for n in names if needle in n.lower())
+
+
+def spec_models(spec: dict[str, Any]) -> dict[str, Any]:
+    """Get the flattened map of models (e.g. 'schemas/Pet') from the specification components."""
+    return map_models(spec.get(OasField.COMPONENTS, {}))
 
 
 def remove_list_prefix(items: list[str]) -> list[str]:
@@ -84,8 +132,28 @@ def open_oas_with_error_handling(filename: str) -> Any:
 
     Avoids the standard Typer error handling that is quite verbose.
     """
+    oas, _ = load_oas_with_error_handling(filename)
+    return oas
+
+
+def load_oas_with_error_handling(filename: str) -> tuple[Any, dict[str, Any]]:
+    """Perform error handling around loading an OpenAPI spec (and operations map).
+
+    The operations map is cached along with the spec, so commands dealing with operations do not
+    need to re-build it.
+    """
+    # re-uses the parsed spec from previous commands when the file is unchanged
+    return load_cached_with_error_handling(load_oas_cached, filename)
+
+
+def load_cached_with_error_handling(load: Callable[[str], Any], filename: str) -> Any:
+    """Perform error handling around loading an OpenAPI spec (or data derived from it, e.g. the tags map).
+
+    The derived data is cached separately from the spec, so commands only needing it do not need to
+    load the full spec.
+    """
     try:
-        return open_oas(filename)
+        return load(filename)
     except FileNotFoundError:
         message = f"failed to find {filename}"
     except Exception as ex:
@@ -96,6 +164,11 @@ def open_oas_with_error_handling(filename: str) -> Any:
     raise typer.Exit(1)
 
 
+def open_section_with_error_handling(filename: str, section: str, default: Any = None) -> Any:
+    """Perform error handling around opening a single top-level section of an OpenAPI spec."""
+    return load_cached_with_error_handling(partial(open_oas_section, section=section, default=default), filename)
+
+
 #################################################
 # Top-level stuff
 app = typer.Typer(
@@ -110,11 +183,9 @@ app = typer.Typer(
 def info(
     filename: OasFilenameArgument,
 ) -> None:
-    spec = open_oas_with_error_handling(filename)
-
-    info = spec.get("info", {})
-    console = console_factory()
-    console.print(yaml.dump({"info": info}, indent=len(INDENT)))
+    # only the 'info' section is needed, and it is typically at the top of the file
+    info = open_section_with_error_handling(filename, "info", {})
+    print_yaml({"info": info})
     return
 
 
@@ -123,27 +194,26 @@ def summary(
     filename: OasFilenameArgument,
 ) -> None:
     spec = open_oas_with_error_handling(filename)
-    method_count = {
+    method_count = Counter({
         'get': 0,
         'put': 0,
         'patch': 0,
         'delete': 0,
         'post': 0,
-    }
-    path_count = 0
-    model_count = len(map_models(spec.get(OasField.COMPONENTS, {})))
-    tag_count = {}
-
-    for path_data in spec.get(OasField.PATHS, {}).values():
-        path_count += 1
-        for method, operation in path_data.items():
-            if method == OasField.PARAMS:
-                continue
-
-            method_count[method] += 1
-            for tag in operation.get(OasField.TAGS, []):
-                orig = tag_count.get(tag, 0)
-                tag_count[tag] = orig + 1
+    })
+    paths = spec.get(OasField.PATHS, {})
+    path_count = len(paths)
+    # just counting, so no need to build the flattened models map
+    model_count = sum(len(values) for values in spec.get(OasField.COMPONENTS, {}).values())
+    tag_count = {tag: len(op_ids) for tag, op_ids in map_tags(paths).items()}
+
+    # Counter.update() counts an iterable in C, instead of a Python-level increment per operation
+    method_count.update(
+        method
+        for path_data in paths.values()
+        for method in path_data.keys()
+        if method in OPERATION_METHODS
+    )
 
     console = console_factory()
     console.print(f"OpenAPI spec ({short_filename(filename)}):")
@@ -171,14 +241,18 @@ def diff(
     ],
 ) -> None:
     old_spec = open_oas_with_error_handling(original)
-    new_spec = open_oas_with_error_handling(updated)
+    if Path(original).resolve() == Path(updated).resolve():
+        new_spec = old_spec
+    else:
+        new_spec = open_oas_with_error_handling(updated)
 
-    console = console_factory()
     diffs = find_diffs(old_spec, new_spec)
-    if not diffs:
-        console.print(f"No differences between {short_filename(original)} and {short_filename(updated)}")
-    else:
-        console.print(yaml.dump(diffs, indent=len(INDENT)))
+    if diffs:
+        print_yaml(diffs)
+        return
+
+    console = console_factory()
+    console.print(f"No differences between {short_filename(original)} and {short_filename(updated)}")
     return
 
 
@@ -191,6 +265,26 @@ class DisplayOption(str, Enum):
     FINAL = "final"
 
 
+class DisplayFormat(str, Enum):
+    """Formats for displaying the data."""
+
+    YAML = "yaml"
+    JSON = "json"
+
+
+def print_data(data: Any, fmt: DisplayFormat = DisplayFormat.YAML, indent: int = len(INDENT)) -> None:
+    """Write the data directly to stdout in the requested format.
+
+    JSON is much faster to produce than YAML, which matters when displaying a full specification.
+    """
+    if fmt == DisplayFormat.JSON:
+        sys.stdout.write(json.dumps(data, indent=indent, default=str))
+        sys.stdout.write("\n")
+        return
+
+    print_yaml(data, indent=indent)
+
+
 @app.command("update", short_help="Update the OpenAPI spec")
 def update(
     original_filename: OasFilenameArgument,
@@ -216,17 +310,23 @@ def update(
         DisplayOption,
         typer.Option("--display", help="Shown on console at conclusion", case_sensitive=False),
     ] = DisplayOption.DIFF,
+    display_format: Annotated[
+        DisplayFormat,
+        typer.Option("--format", help="Format for the diff/final display", case_sensitive=False),
+    ] = DisplayFormat.YAML,
     indent: Annotated[
         int,
-        typer.Option(min=1, max=10, help="Number of characters to indent on YAML display"),
+        typer.Option(min=1, max=10, help="Number of characters to indent on YAML/JSON display"),
     ] = len(INDENT),
 ) -> None:
-    old_spec = open_oas_with_error_handling(original_filename)
-    updated = deepcopy(old_spec)
-
+    # check the arguments before spending time loading the spec
     if allowed_operations and remove_operations:
         error_out("cannot specify both --allow-op and --remove-op")
 
+    old_spec = open_oas_with_error_handling(original_filename)
+    # NOTE: the update functions are non-destructive (they return modified copies), so no need to copy here
+    updated = old_spec
+
     if remove_all_tags:
         updated = remove_schema_tags(updated)
 
@@ -244,19 +344,27 @@ def update(
         updated = schema_operations_filter(updated, allow=set(allowed_operations))
 
     if updated_filename:
-        with open(updated_filename, "w", encoding="utf-8", newline="\n") as fp:
-            yaml.dump(updated, fp, indent=indent)
+        # keep the original key order, so the updated file only differs where something changed
+        with open(updated_filename, "w", encoding="utf-8", newline="\n", buffering=YAML_WRITE_BUFFER) as fp:
+            yaml.dump(updated, fp, Dumper=YamlDumper, indent=indent, sort_keys=False)
 
-    console = console_factory()
-    diffs = find_diffs(old_spec, updated)
     if display_option == DisplayOption.NONE:
-        pass
-    elif display_option == DisplayOption.FINAL:
-        console.print(yaml.dump(updated, indent=indent))
-    elif not diffs:
+        return
+
+    if display_option == DisplayOption.FINAL:
+        print_data(updated, display_format, indent=indent)
+        return
+
+    # only the summary/diff displays need the differences
+    # every transform returns a modified copy, so nothing changed when still looking at the original
+    diffs = find_diffs(old_spec, updated) if updated is not old_spec else {}
+    if diffs and display_option == DisplayOption.DIFF:
+        print_data(diffs, display_format, indent=indent)
+        return
+
+    console = console_factory()
+    if not diffs:
         console.print(f"No differences between {short_filename(original_filename)} and updated")
-    elif display_option == DisplayOption.DIFF:
-        console.print(yaml.dump(diffs, indent=indent))
     else:  # must be DisplayOption.SUMMARY:
         diff_count = count_values(diffs)
         console.print(f"Found {diff_count} differences from {short_filename(original_filename)}")
@@ -284,13 +392,8 @@ def operation_list(
         typer.Option("--contains", help="Search for this value in the operation names"),
     ] = None,
 ) -> None:
-    spec = open_oas_with_error_handling(filename)
-
-    operations = map_operations(spec.get(OasField.PATHS, {}))
-    names = sorted(operations.keys())
-    if search:
-        needle = search.lower()
-        names = [_ for _ in names if needle in _.lower()]
+    _, operations = load_oas_with_error_handling(filename)
+    names = sorted_matches(operations.keys(), search)
 
     console = console_factory()
     match_info = f" matching '{search}'" if search else ""
@@ -309,9 +412,7 @@ def operation_show(
     filename: OasFilenameArgument,
     operation_name: Annotated[str, typer.Argument(help="Name of the operation to show")],
 ) -> None:
-    spec = open_oas_with_error_handling(filename)
-
-    operations = map_operations(spec.get(OasField.PATHS, {}))
+    _, operations = load_oas_with_error_handling(filename)
     operation = operations.get(operation_name)
     if not operation:
         error_out(f"failed to find {operation_name}")
@@ -324,8 +425,7 @@ def operation_show(
         inner["params"] = path_params
     inner[method] = operation
 
-    console = console_factory()
-    console.print(yaml.dump({path: inner}, indent=len(INDENT)))
+    print_yaml({path: inner})
     return
 
 
@@ -334,15 +434,13 @@ def operation_models(
     filename: OasFilenameArgument,
     operation_name: Annotated[str, typer.Argument(help="Name of the operation")],
 ) -> None:
-    spec = open_oas_with_error_handling(filename)
-
-    operations = map_operations(spec.get(OasField.PATHS, {}))
+    spec, operations = load_oas_with_error_handling(filename)
     operation = operations.get(operation_name)
     if not operation:
         error_out(f"failed to find {operation_name}")
 
     op_references = find_references(operation)
-    models = map_models(spec.get(OasField.COMPONENTS, {}))
+    models = spec_models(spec)
     matches = model_filter(models, op_references)
 
     console = console_factory()
@@ -412,7 +510,7 @@ def paths_show(
 
     if include_models:
         references = find_references(paths)
-        models = map_models(spec.get(OasField.COMPONENTS, {}))
+        models = spec_models(spec)
         used = model_filter(models, references)
         results = {
             OasField.PATHS.value: paths,
@@ -420,8 +518,7 @@ def paths_show(
         }
         paths = results
 
-    console = console_factory()
-    console.print(yaml.dump(paths, indent=len(INDENT)))
+    print_yaml(paths)
     return
 
 
@@ -436,19 +533,17 @@ def paths_operations(
 
     result = {}
     paths = find_paths(spec.get(OasField.PATHS, {}), path_name, include_subpaths)
+    op_id_key = OasField.OP_ID.value
     for path, path_data in paths.items():
-        for method, op_data in path_data.items():
-            if method == OasField.PARAMS:
-                continue
-            op_id = op_data.get(OasField.OP_ID)
-            items = result.get(path, []) + [op_id]
-            result[path] = items
+        # build each path's list in one go, instead of a dict lookup per operation
+        op_ids = [op_data.get(op_id_key) for method, op_data in path_data.items() if method in OPERATION_METHODS]
+        if op_ids:
+            result[path] = op_ids
 
     if not result:
         error_out(f"failed to find {path_name}")
 
-    console = console_factory()
-    console.print(yaml.dump(result, indent=len(INDENT)))
+    print_yaml(result)
     return
 
 
@@ -467,11 +562,8 @@ def models_list(
 ) -> None:
     spec = open_oas_with_error_handling(filename)
 
-    models = map_models(spec.get(OasField.COMPONENTS, {}))
-    names = sorted(models.keys())
-    if search:
-        needle = search.lower()
-        names = [_ for _ in names if needle in _.lower()]
+    models = spec_models(spec)
+    names = sorted_matches(models.keys(), search)
 
     console = console_factory()
     match_info = f" matching '{search}'" if search else ""
@@ -494,7 +586,7 @@ def models_show(
 ) -> None:
     spec = open_oas_with_error_handling(filename)
 
-    models = map_models(spec.get(OasField.COMPONENTS, {}))
+    models = spec_models(spec)
     full_name = model_full_name(models, model_name)
     model = models.get(full_name)
     if not model:
@@ -506,8 +598,7 @@ def models_show(
         models = model_filter(models, {full_name})
     models = remove_dict_prefix(models)
 
-    console = console_factory()
-    console.print(yaml.dump(models, indent=len(INDENT)))
+    print_yaml(models)
     return
 
 
@@ -516,17 +607,14 @@ def models_uses(
     filename: OasFilenameArgument,
     model_name: Annotated[str, typer.Argument(help="Name of the model to show")],
 ) -> None:
-    spec = open_oas_with_error_handling(filename)
-
-    models = map_models(spec.get(OasField.COMPONENTS, {}))
-    full_name = model_full_name(models, model_name)
+    references = load_cached_with_error_handling(load_model_references_cached, filename)
+    full_name = model_full_name(references, model_name)
     if not full_name:
         error_out(f"no model '{model_name}' found")
 
-    references = model_references(models)
+    matches = unroll(references, references[full_name])
 
     console = console_factory()
-    matches = unroll(references, references.get(full_name))
     if not matches:
         console.print(f"{model_name} does not use any other models")
     else:
@@ -543,15 +631,14 @@ def models_used_by(
     filename: OasFilenameArgument,
     model_name: Annotated[str, typer.Argument(help="Name of the model to show")],
 ) -> None:
-    spec = open_oas_with_error_handling(filename)
-
-    models = map_models(spec.get(OasField.COMPONENTS, {}))
-    full_name = model_full_name(models, model_name)
+    references = load_cached_with_error_handling(load_model_references_cached, filename)
+    full_name = model_full_name(references, model_name)
     if not full_name:
         error_out(f"no model '{model_name}' found")
 
     console = console_factory()
-    matches = models_referenced_by(models, full_name)
+    referenced_by = reverse_references(references)
+    matches = unroll(referenced_by, referenced_by.get(full_name))
     if not matches:
         console.print(f"{model_name} is not used by any other models")
     else:
@@ -568,9 +655,10 @@ def models_operations(
     filename: OasFilenameArgument,
     model_name: Annotated[str, typer.Argument(help="Name of the model to search for")],
 ) -> None:
+    # the operations need the full spec, so the references come from it (instead of the cache)
     spec = open_oas_with_error_handling(filename)
 
-    models = map_models(spec.get(OasField.COMPONENTS, {}))
+    models = spec_models(spec)
     full_name = model_full_name(models, model_name)
     if not full_name:
         error_out(f"no model '{model_name}' found")
@@ -581,7 +669,7 @@ def models_operations(
     matches = []
     for path_data in spec.get(OasField.PATHS, {}).values():
         for method, op_data in path_data.items():
-            if method == OasField.PARAMS:
+            if method not in OPERATION_METHODS:
                 continue
             references = find_references(op_data)
             if references.intersection(model_refs):
@@ -607,23 +695,8 @@ def tags_list(
     filename: OasFilenameArgument,
     search: Annotated[Optional[str], typer.Option("--contains", help="Search for this value in the tag names")] = None,
 ) -> None:
-    spec = open_oas_with_error_handling(filename)
-
-    # NOTE: not all OAS's include a "tags" section, so walk the operations
-
-    tags = set()
-    for path_data in spec.get(OasField.PATHS, {}).values():
-        for method, operation in path_data.items():
-            if method == OasField.PARAMS:
-                continue
-
-            for t in operation.get(OasField.TAGS):
-                tags.add(t)
-
-    names = sorted(tags)
-    if search:
-        needle = search.lower()
-        names = [_ for _ in names if needle in _.lower()]
+    # NOTE: not all OAS's include a "tags" section, so the tags are gathered from the operations
+    names = sorted_matches(load_cached_with_error_handling(load_tags_cached, filename), search)
 
     console = console_factory()
     match_info = f" matching '{search}'" if search else ""
@@ -642,27 +715,13 @@ def tags_show(
     filename: OasFilenameArgument,
     tag_name: Annotated[str, typer.Argument(help="Name of the tag to show")],
 ) -> None:
-    spec = open_oas_with_error_handling(filename)
-
-    operations = {}
-    for path, path_data in spec.get(OasField.PATHS, {}).items():
-        params = path_data.get(OasField.PARAMS)
-        for method, operation in path_data.items():
-            if method == OasField.PARAMS:
-                continue
-
-            if tag_name in operation.get(OasField.TAGS):
-                op_id = operation.get(OasField.OP_ID)
-                operation[OasField.X_PATH] = path
-                operation[OasField.X_METHOD] = method
-                operation[OasField.X_PATH_PARAMS] = params
-                operations[op_id] = operation
-
+    # only the operation identifiers are displayed, so the spec itself is not needed
+    operations = set(load_cached_with_error_handling(load_tags_cached, filename).get(tag_name, ()))
     if not operations:
         error_out(f"failed to find {tag_name}")
 
     console = console_factory()
-    names = sorted(operations.keys())
+    names = sorted(operations)
     console.print(f"Tag {tag_name} has {len(names)} operations:")
     for n in names:
         console.print(f"{INDENT}{n}")
@@ -684,7 +743,7 @@ def content_type_list(
     content = map_content_types(spec)
 
     if content_type:
-        content = {k: v for k, v in content.items() if k == content_type}
+        content = {content_type: content[content_type]} if content_type in content else {}
 
     console = console_factory()
     if not content:
@@ -693,7 +752,8 @@ def content_type_list(
 
     for name, operations in content.items():
         console.print(name)
-        for op_id in sorted(operations)[:max_size]:
+        # only the first few are shown, so avoid sorting all the operations
+        for op_id in heapq.nsmallest(max_size, operations):
             console.print(f"    {op_id}")
         if len(operations) > max_size:
             console.print("    ...")
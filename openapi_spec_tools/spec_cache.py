@@ -0,0 +1,229 @@
+"""Cache of parsed OpenAPI specifications.
+
+Parsing a large OpenAPI specification (especially YAML) dominates the time for short commands like
+checking a layout file. The parsed specification and its operations map are pickled into a cache
+directory, and re-used as long as the source file has not changed (same path, inode, size, and
+modification/change times). Each specification has one cache file (named by its path), so re-caching an updated
+specification replaces the stale entry.
+
+The maps of model references (see `model_references()`) and tags (see `map_tags()`) are cached
+separately, so commands that only need them (e.g. `oas models used-by` or `oas tags list`) avoid loading
+the full specification when it is cached.
+
+Caching is opt-in: set the `OAS_CACHE_DIR` environment variable to the cache directory. Without it (or
+with an empty value) nothing is cached, so every load parses the specification.
+Since unpickling can run arbitrary code, cache files are created private to the current user, and files
+owned (or writable) by anyone else are ignored.
+"""
+import hashlib
+import os
+import pickle
+import stat
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from openapi_spec_tools.types import OasField
+from openapi_spec_tools.utils import map_models
+from openapi_spec_tools.utils import map_operations
+from openapi_spec_tools.utils import map_tags
+from openapi_spec_tools.utils import model_references
+from openapi_spec_tools.utils import open_oas
+
+CACHE_DIR_ENV = "OAS_CACHE_DIR"
+
+# Bump when the cached contents change (e.g. the map_operations() output)
+CACHE_VERSION = 2
+
+# Suffix for the cache entry of the model references cached for a specification
+MODEL_REFS_SUFFIX = ":model-references"
+
+# Suffix for the cache entry of the tags map cached for a specification
+TAGS_SUFFIX = ":tags"
+
+
+def cache_directory() -> Optional[Path]:
+    """Get the directory used to store cached specifications, or None when caching is disabled.
+
+    Caching is opt-in, so nothing is written unless the directory is provided.
+    """
+    value = os.environ.get(CACHE_DIR_ENV)
+    return Path(value) if value else None
+
+
+def cache_header(filename: str) -> bytes:
+    """Get the header identifying the current contents of the OpenAPI specification filename.
+
+    The header holds the cache version, inode, size, and modification/change times, so any change to the
+    specification (or to the cached contents) results in a different header. The change time is updated
+    whenever the file is written, even when the modification time is set back.
+    """
+    st = os.stat(filename)
+    fields = (CACHE_VERSION, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+    return ("oas-cache " + ":".join(str(f) for f in fields) + "\n").encode("ascii")
+
+
+def _cache_id(filename: str, suffix: str = "") -> str:
+    """Get the identifier for the data cached for the OpenAPI specification filename."""
+    return f"{Path(filename).resolve()}{suffix}"
+
+
+def _id_filename(cache_id: str) -> Optional[Path]:
+    """Get the cache file for the identifier, or None when caching is disabled.
+
+    The file name only depends on the specification path (and suffix), so updated data replaces the
+    stale entry instead of adding another file.
+    """
+    directory = cache_directory()
+    if directory is None:
+        return None
+
+    digest = hashlib.blake2b(cache_id.encode("utf-8"), digest_size=16).hexdigest()
+    return directory / f"{digest}.pickle"
+
+
+def cache_filename(filename: str) -> Optional[Path]:
+    """Get the cache file for the provided OpenAPI specification filename."""
+    return _id_filename(_cache_id(filename))
+
+
+def _discard(cache_file: Path) -> None:
+    """Remove a stale (or unreadable) cache file -- failures are ignored."""
+    try:
+        cache_file.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _is_private(st: os.stat_result) -> bool:
+    """Check the file is owned by the current user, and cannot be written by anyone else.
+
+    Unpickling can run arbitrary code, so only files that nobody else could have written are loaded.
+    """
+    if not hasattr(os, "getuid"):  # pragma: no cover
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _read_cache(cache_file: Path, header: bytes) -> Optional[bytes]:
+    """Read the cached data when its header matches -- any failure is treated as a cache miss.
+
+    The (plain text) header is written ahead of the data, so a stale entry is detected without unpickling
+    the data. Stale and unreadable entries are removed, so they do not outlive a failure to re-build them.
+    Files that could have been written by another user are ignored (and left alone).
+    """
+    try:
+        with cache_file.open("rb") as fp:
+            if not _is_private(os.fstat(fp.fileno())):
+                return None
+            if fp.readline() == header:
+                return fp.read()
+    except FileNotFoundError:
+        return None
+    except Exception:
+        pass
+
+    _discard(cache_file)
+    return None
+
+
+def _unpickle(data: bytes) -> Optional[Any]:
+    """Unpickle the cached data -- any failure is treated as a cache miss."""
+    try:
+        return pickle.loads(data)
+    except Exception:
+        return None
+
+
+def _write_cache(cache_file: Path, header: bytes, data: bytes) -> None:
+    """Write the header and cached data atomically -- failures are ignored, since the cache is an optimization.
+
+    The file is only readable/writable by the current user.
+    """
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "wb") as fp:
+            fp.write(header)
+            fp.write(data)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+
+
+def _load_cached(filename: str, suffix: str, build: Callable[[str], Any]) -> Any:
+    """Get the data for the filename (and suffix) from the cache directory, otherwise build (and cache) it.
+
+    Each call unpickles (or builds) its own copy, so callers are free to modify the results.
+    """
+    cache_file = _id_filename(_cache_id(filename, suffix))
+    if cache_file is None:
+        # caching is disabled, so nothing gets pickled
+        return build(filename)
+
+    header = cache_header(filename)
+    data = _read_cache(cache_file, header)
+    loaded = _unpickle(data) if data is not None else None
+    if loaded is None:
+        if data is not None:
+            _discard(cache_file)
+        loaded = build(filename)
+        _write_cache(cache_file, header, pickle.dumps(loaded, protocol=pickle.HIGHEST_PROTOCOL))
+
+    return loaded
+
+
+def _parse_oas(filename: str) -> tuple[Any, dict[str, Any]]:
+    """Parse the OpenAPI specification, and create the operations map."""
+    oas = open_oas(filename)
+    return oas, map_operations(oas.get(OasField.PATHS, {}))
+
+
+def _parse_model_references(filename: str) -> dict[str, set[str]]:
+    """Create the map of model names to their references from the (cached) OpenAPI specification."""
+    oas, _ = load_oas_cached(filename)
+    return model_references(map_models(oas.get(OasField.COMPONENTS, {})))
+
+
+def _parse_tags(filename: str) -> dict[str, list[Optional[str]]]:
+    """Create the map of tag names to operationId's from the (cached) OpenAPI specification."""
+    oas, _ = load_oas_cached(filename)
+    return map_tags(oas.get(OasField.PATHS, {}))
+
+
+def load_oas_cached(filename: str) -> tuple[Any, dict[str, Any]]:
+    """Open the OpenAPI specification, and return it along with the operations map.
+
+    Uses the cached copy when the specification is unchanged, otherwise parses the file and
+    updates the cache. Each call unpickles its own copy, so callers are free to modify the results.
+    """
+    if not Path(filename).exists():
+        raise FileNotFoundError(filename)
+
+    return _load_cached(filename, "", _parse_oas)
+
+
+def load_model_references_cached(filename: str) -> dict[str, set[str]]:
+    """Get the map of model names (e.g. 'schemas/Pet') to the models they reference directly.
+
+    Uses the cached copy when the specification is unchanged, so the specification itself does not
+    need to be loaded.
+    """
+    if not Path(filename).exists():
+        raise FileNotFoundError(filename)
+
+    return _load_cached(filename, MODEL_REFS_SUFFIX, _parse_model_references)
+
+
+def load_tags_cached(filename: str) -> dict[str, list[Optional[str]]]:
+    """Get the map of tag names to the operationId's using them.
+
+    Uses the cached copy when the specification is unchanged, so the specification itself does not
+    need to be loaded.
+    """
+    if not Path(filename).exists():
+        raise FileNotFoundError(filename)
+
+    return _load_cached(filename, TAGS_SUFFIX, _parse_tags)
@@ -1,6 +1,6 @@
 """Utilties for analyzing and manipulating OpenAPI specifications."""
 import json
-from copy import deepcopy
+from itertools import chain
 from itertools import zip_longest
 from pathlib import Path
 from typing import Any
@@ -9,21 +9,96 @@ from typing import Union
 
 import yaml
 
+from openapi_spec_tools._yaml import YamlLoader
+from openapi_spec_tools._yaml import load_section
 from openapi_spec_tools.types import OasField
 
 NULL_TYPES = {'null', '"null"', "'null'"}
 
+# keys of a path item that are operations -- others are 'parameters', 'summary', 'servers', extensions, etc.
+OPERATION_METHODS = frozenset({"get", "put", "post", "delete", "options", "head", "patch", "trace"})
+
+# parts of a reference (e.g. '#/components/schemas/Pet') dropped from the short name
+_REF_PREFIX_PARTS = frozenset({'#', OasField.COMPONENTS.value})
+
+# plain string keys used when checking every property for nullable types
+_NULLABLE_KEY = OasField.NULLABLE.value
+_TYPE_KEY = OasField.TYPE.value
+_NULLABLE_OPTIONS = (OasField.ANY_OF.value, OasField.ONE_OF.value)
+
+# simple value types counted by count_values()
+_COUNTED_TYPES = (str, int, bool, float)
+
+# amount of the start of a file used to check whether it looks like JSON
+JSON_SNIFF_SIZE = 1024
+
 
 def open_oas(filename: str) -> Any:
-    """Open the specified filename, and return the dictionary."""
+    """Open the specified filename, and return the dictionary.
+
+    JSON is a subset of YAML, and some specifications are published as JSON with a YAML filename. The
+    JSON parser is much faster than the YAML parser, so it is tried first for anything that looks like
+    a JSON document, falling back to YAML when it is not valid JSON.
+
+    YAML documents are parsed straight from the file, so the full text is not held in memory while
+    parsing.
+    """
     path = Path(filename)
     if not path.exists():
         raise FileNotFoundError(filename)
 
     with open(filename, "r", encoding="utf-8", newline="\n") as fp:
-        if filename.endswith('json'):
-            return json.load(fp)
-        return yaml.safe_load(fp)
+        is_json = filename.endswith('json')
+        if not is_json and not fp.read(JSON_SNIFF_SIZE).lstrip().startswith("{"):
+            fp.seek(0)
+            return yaml.load(fp, Loader=YamlLoader)
+
+        fp.seek(0)
+        text = fp.read()
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        if is_json:
+            raise
+
+    return yaml.load(text, Loader=YamlLoader)
+
+
+def open_oas_section(filename: str, section: str, default: Any = None) -> Any:
+    """Open the specified filename, and return just the top-level 'section' (or the default when missing).
+
+    For YAML documents, parsing stops once the section has been read, so small sections near the top
+    (e.g. 'info') do not require parsing the full specification. Falls back to opening the full
+    specification when the section cannot be loaded by itself (e.g. it uses an alias defined elsewhere).
+    """
+    path = Path(filename)
+    if not path.exists():
+        raise FileNotFoundError(filename)
+
+    if not filename.endswith('json'):
+        try:
+            with open(filename, "r", encoding="utf-8", newline="\n") as fp:
+                return load_section(fp, section, default)
+        except yaml.YAMLError:
+            pass
+
+    data = open_oas(filename)
+    return data.get(section, default) if isinstance(data, dict) else default
+
+
+def clone_data(obj: Any) -> Any:
+    """Make a deep copy of parsed JSON/YAML data.
+
+    Parsed specifications only contain dicts, lists, and immutable scalars, so this is much faster
+    than copy.deepcopy() which needs to handle arbitrary objects (and keep a memo of copied objects).
+    """
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {k: clone_data(v) for k, v in obj.items()}
+    if obj_type is list:
+        return [clone_data(v) for v in obj]
+    return obj
 
 
 def unroll(full_set: dict[str, set[str]], items: set[str]) -> set[str]:
@@ -34,6 +109,9 @@ def unroll(full_set: dict[str, set[str]], items: set[str]) -> set[str]:
 
     The return is the set of all items of the referenced from the inputs.
 
+    The references are walked iteratively, and each name is only expanded once, so shared and
+    circular references do not cause repeated work (or unbounded recursion).
+
     Example:
     =======
        full_set = {
@@ -48,41 +126,54 @@ def unroll(full_set: dict[str, set[str]], items: set[str]) -> set[str]:
        result = {b, c, d, e}
 
     """
-    result = deepcopy(items)
-
-    for i in items:
-        sub = full_set.get(i)
-        if sub:
-            result.update(unroll(full_set, sub))
+    result = set(items or ())
+    pending = list(result)
+    while pending:
+        for ref in full_set.get(pending.pop()) or ():
+            if ref not in result:
+                result.add(ref)
+                pending.append(ref)
 
     return result
 
 
-def find_dict_prop(obj: dict[str, Any], prop_name: str) -> set[str]:
-    """Get the string values of all the 'prop_name' properties in the 'obj'.
+def _find_prop(stack: list[dict[str, Any]], prop_name: str) -> set[str]:
+    """Get the values of all the 'prop_name' properties in the dictionaries on the 'stack' (and below).
 
-    This works recursively, so it can be used to walk everything in 'obj' (and not just the top level).
+    The dictionaries are walked with an explicit stack (instead of recursion), so deeply nested data
+    does not hit the recursion limit, and all the values are added to a single set.
     """
     result = set()
-    for name, data in obj.items():
-        if name == prop_name:
-            result.add(data)
-        elif isinstance(data, list):
-            result.update(find_list_prop(data, prop_name))
-        elif isinstance(data, dict):
-            result.update(find_dict_prop(data, prop_name))
+    add = result.add
+    push = stack.append
+    while stack:
+        for name, data in stack.pop().items():
+            if name == prop_name:
+                add(data)
+                continue
+            # parsed data only contains plain dicts and lists, so exact type checks are enough
+            data_type = type(data)
+            if data_type is dict:
+                push(data)
+            elif data_type is list:
+                for item in data:
+                    if type(item) is dict:
+                        push(item)
 
     return result
 
 
+def find_dict_prop(obj: dict[str, Any], prop_name: str) -> set[str]:
+    """Get the string values of all the 'prop_name' properties in the 'obj'.
+
+    This walks everything in 'obj' (and not just the top level).
+    """
+    return _find_prop([obj], prop_name)
+
+
 def find_list_prop(items: list[Any], prop_name: str) -> set[str]:
     """Get the string values of all the 'prop_name' properties in the list of dictionaries 'items'."""
-    result = set()
-    for item in items:
-        if isinstance(item, dict):
-            result.update(find_dict_prop(item, prop_name))
-
-    return result
+    return _find_prop([item for item in items if isinstance(item, dict)], prop_name)
 
 
 def shorten_text(text: str, max_len: int = 16) -> str:
@@ -100,8 +191,89 @@ def find_diffs(lhs: dict[str, Any], rhs: dict[str, Any]) -> dict[str, Any]:
     without providing all the details. It recursively walks the pair of dictionaries to provide
     the differences.
     """
+    assert isinstance(lhs, dict) and isinstance(rhs, dict)
+    if lhs is rhs or lhs == rhs:
+        # shared or equal (compared in C, without walking them here) dictionaries have no differences
+        return {}
+
+    return _dict_diffs(lhs, rhs)
+
+
+def _dict_diffs(lhs: dict[str, Any], rhs: dict[str, Any]) -> dict[str, Any]:
+    """Walk the pair of dictionaries to find the differences (see 'find_diffs()').
+
+    Nested dictionaries are only skipped when shared, since comparing each level with '==' would
+    compare the same subtrees over and over. Leaf values (and lists without dictionaries) are compared
+    with '==' before looking for the differences.
+    """
     result = {}
     assert isinstance(lhs, dict) and isinstance(rhs, dict)
+    if lhs is rhs:
+        # shared (unmodified) objects have no differences
+        return result
+
+    lkeys = set(lhs.keys())
+    rkeys = set(rhs.keys())
+
+    added = rkeys - lkeys
+    for k in added:
+        result[k] = "added"
+
+    removed = lkeys - rkeys
+    for k in removed:
+        result[k] = "removed"
+
+    common = lkeys & rkeys
+    for k in common:
+        left = lhs[k]
+        right = rhs[k]
+        if left is right:
+            # shared (unmodified) objects have no differences
+            continue
+        if left is None:
+            # avoids failures due to trying to treat right as dict/list
+            result[k] = "original is None"
+        elif right is None:
+            result[k] = "updated is None"
+        elif type(left) is not type(right):
+            # avoids failures due to trying to treat a scalar as a dict/list
+            result[k] = f"{shorten_text(str(left))} != {shorten_text(str(right))}"
+        elif isinstance(left, dict):
+            # recursive call to find sub-object deltas
+            diffs = _dict_diffs(left, right)
+            if diffs:
+                result[k] = diffs
+        elif isinstance(left, list) and left and isinstance(left[0], dict):
+            if len(left) != len(right):
+                result[k] = f"different lengths: {len(left)} != {len(right)}"
+            else:
+                for index, (lvalue, rvalue) in enumerate(zip_longest(left, right)):
+                    # recursive call to find sub-object deltas
+                    vdiff = _dict_diffs(lvalue, rvalue)
+                    if vdiff:
+                        item_key = f"{k}[{index}]"
+                        result[item_key] = vdiff
+        elif left == right:
+            # equal leaf values (or lists without dictionaries, e.g. lists of lists) have no differences
+            continue
+        elif isinstance(left, list) and left:
+            # simple list items here
+            lvalues = set(left)
+            rvalues = set(right)
+            deltas = []
+            added = rvalues - lvalues
+            if added:
+                deltas.append(f"added {', '.join(sorted(added))}")
+            removed = lvalues - rvalues
+            if removed:
+                deltas.append(f"removed {', '.join(sorted(removed))}")
+            if deltas:
+                result[k] = "; ".join(deltas)
+        else:
+            result[k] = f"{shorten_text(str(left))} != {shorten_text(str(right))}"
+
+    return result
+
     lkeys = set(lhs.keys())
     rkeys = set(rhs.keys())
 
@@ -117,14 +289,17 @@ def find_diffs(lhs: dict[str, Any], rhs: dict[str, Any]) -> dict[str, Any]:
     for k in common:
         left = lhs[k]
         right = rhs[k]
-        if left is None or right is None:
+        if left is right or left == right:
+            # shared or equal values (compared in C, without walking them here) have no differences
+            continue
+        if left is None:
             # avoids failures due to trying to treat right as dict/list
-            if left == right:
-                pass
-            elif left is None:
-                result[k] = "original is None"
-            elif right is None:
-                result[k] = "updated is None"
+            result[k] = "original is None"
+        elif right is None:
+            result[k] = "updated is None"
+        elif type(left) is not type(right):
+            # avoids failures due to trying to treat a scalar as a dict/list
+            result[k] = f"{shorten_text(str(left))} != {shorten_text(str(right))}"
         elif isinstance(left, dict):
             # recursive call to find sub-object deltas
             diffs = find_diffs(left, right)
@@ -160,24 +335,32 @@ def find_diffs(lhs: dict[str, Any], rhs: dict[str, Any]) -> dict[str, Any]:
 
 
 def count_values(obj: dict[str, Any]) -> int:
-    """Recursively walk the 'obj' dictionary to count the simple values (e.g. int, float, bool).
+    """Walk the 'obj' dictionary to count the simple values (e.g. int, float, bool).
 
-    This is useful for counting the number of differences as determined by 'find_diffs()'.
+    This is useful for counting the number of differences as determined by 'find_diffs()'. The
+    dictionaries are walked with an explicit stack (instead of recursion), so deeply nested data does
+    not hit the recursion limit.
     """
     total = 0
-    for key, value in obj.items():
-        if isinstance(value, (str, int, bool, float)):
-            total += 1
-        elif isinstance(value, dict):
-            total += count_values(value)
-        elif isinstance(value, (list, set)):
-            for item in value:
-                if isinstance(item, dict):
-                    total += count_values(item)
-                else:
-                    total += 1
-        else:
-            raise ValueError(f"Unhandled type {type(value).__name__} for '{key}'")
+    stack = [obj]
+    push = stack.append
+    while stack:
+        for key, value in stack.pop().items():
+            # exact type check for plain dictionaries, since they are by far the most common container
+            if type(value) is dict:
+                push(value)
+            elif isinstance(value, _COUNTED_TYPES):
+                total += 1
+            elif isinstance(value, dict):
+                push(value)
+            elif isinstance(value, (list, set)):
+                for item in value:
+                    if isinstance(item, dict):
+                        push(item)
+                    else:
+                        total += 1
+            else:
+                raise ValueError(f"Unhandled type {type(value).__name__} for '{key}'")
 
     return total
 
@@ -186,14 +369,15 @@ def short_ref(full_name: str) -> str:
     """Get the shorter reference name (drops the '#/component')."""
     values = [
         part for part in full_name.split('/')
-        if part and part not in ('#', OasField.COMPONENTS.value)
+        if part and part not in _REF_PREFIX_PARTS
     ]
     return '/'.join(values)
 
 
 def find_references(obj: dict[str, Any]) -> set[str]:
     """Walk the 'obj' dictionary to find all the reference values (e.g. "$ref")."""
-    refs = find_dict_prop(obj, OasField.REFS)
+    # plain string, since this gets compared against every key in the walk
+    refs = find_dict_prop(obj, OasField.REFS.value)
     return {short_ref(_) for _ in refs}
 
 
@@ -203,27 +387,52 @@ def model_references(models: dict[str, Any]) -> set[str]:
     return {name: find_references(body) for name, body in models.items()}
 
 
+def unroll_models(models: dict[str, Any], items: set[str]) -> set[str]:
+    """Unroll all the model references from items.
+
+    This is the same as `unroll(model_references(models), items)`, but only the models that are
+    reached get walked for their references (and each only once), instead of every model.
+    """
+    result = set(items or ())
+    pending = list(result)
+    while pending:
+        body = models.get(pending.pop())
+        if body is None:
+            continue
+        for ref in find_references(body):
+            if ref not in result:
+                result.add(ref)
+                pending.append(ref)
+
+    return result
+
+
 def model_filter(models: dict[str, Any], references: set[str]) -> dict[str, Any]:
     """Filter the models to those which are referenced.
 
     Includes direct and indirect references.
     """
-    model_ref_map = model_references(models)
-    used_models = unroll(model_ref_map, references)
+    used_models = unroll_models(models, references)
 
     return {name: models[name] for name in used_models}
 
 
-def models_referenced_by(models: dict[str, Any], model_name: str) -> set[str]:
-    """Find a list of other models which reference the provided model."""
+def reverse_references(references: dict[str, set[str]]) -> dict[str, set[str]]:
+    """Invert the map of names to their references (e.g. from 'model_references()').
+
+    The result maps each referenced name to the set of names referencing it.
+    """
     referenced_by = {}
-    for name, body in models.items():
-        refs = find_references(body)
+    for name, refs in references.items():
         for r in refs:
-            curr = referenced_by.get(r, set())
-            curr.add(name)
-            referenced_by[r] = curr
+            referenced_by.setdefault(r, set()).add(name)
+
+    return referenced_by
+
 
+def models_referenced_by(models: dict[str, Any], model_name: str) -> set[str]:
+    """Find a list of other models which reference the provided model."""
+    referenced_by = reverse_references(model_references(models))
     return unroll(referenced_by, referenced_by.get(model_name, set()))
 
 
@@ -245,9 +454,7 @@ def unmap_models(models: dict[str, Any]) -> dict[str, Any]:
         parts = full_name.split('/')
         comp_name = parts[0]
         model_name = parts[1]
-        temp = components.get(comp_name, {})
-        temp[model_name] = model_def
-        components[comp_name] = temp
+        components.setdefault(comp_name, {})[model_name] = model_def
 
     return components
 
@@ -264,6 +471,17 @@ def model_full_name(models: dict[str, Any], name: str) -> Optional[str]:
     return None
 
 
+def _operation_entries(paths: dict[str, Any]) -> dict[str, tuple[str, str, dict[str, Any]]]:
+    """Create a map of operationId to the (path, method, operation data) -- nothing is copied."""
+    op_id_key = OasField.OP_ID.value
+    return {
+        op_data.get(op_id_key): (path, method, op_data)
+        for path, path_data in paths.items()
+        for method, op_data in path_data.items()
+        if method in OPERATION_METHODS
+    }
+
+
 def map_operations(paths: dict[str, Any]) -> dict[str, Any]:
     """Create map of operationId to path data.
 
@@ -315,39 +533,60 @@ def map_operations(paths: dict[str, Any]) -> dict[str, Any]:
     }
 
     """
+    # plain strings (instead of enum lookups) for the per-operation keys
+    params_key = OasField.PARAMS.value
+    op_id_key = OasField.OP_ID.value
+    x_path = OasField.X_PATH.value
+    x_path_params = OasField.X_PATH_PARAMS.value
+    x_method = OasField.X_METHOD.value
+
     result = {}
     for path, path_data in paths.items():
-        local_path = deepcopy(path_data)
-        path_params = local_path.pop(OasField.PARAMS, None)
-        for method, op_data in local_path.items():
-            op_id = op_data.get(OasField.OP_ID)
-            op_data[OasField.X_PATH.value] = path
-            op_data[OasField.X_PATH_PARAMS.value] = path_params
-            op_data[OasField.X_METHOD.value] = method
-            result[op_id] = op_data
+        path_params = clone_data(path_data.get(params_key))
+        for method, op_data in path_data.items():
+            if method not in OPERATION_METHODS:
+                continue
+            op_data = clone_data(op_data)
+            op_data[x_path] = path
+            op_data[x_path_params] = path_params
+            op_data[x_method] = method
+            result[op_data.get(op_id_key)] = op_data
 
     return result
 
 
-def find_paths(paths: dict[str, Any], search: Optional[str] = None, sub_paths: bool = False) -> dict[str, Any]:
-    """Search the 'paths' dictionary for path names including the 'search' string (if provided)."""
-    def anon(s: str) -> str:
-        return s.lower().rstrip("/")
+def map_tags(paths: dict[str, Any]) -> dict[str, list[Optional[str]]]:
+    """Create map of tag names to the operationId's using them.
+
+    Not all OAS's include a "tags" section (or tags on every operation), so this walks the operations
+    once, and operations without tags are simply not included.
+    """
+    tags_key = OasField.TAGS.value
+    op_id_key = OasField.OP_ID.value
 
     result = {}
-    needle = None if search is None else anon(search)
-    for path, path_data in paths.items():
-        if needle:
-            name = anon(path)
-            if not sub_paths and name != needle:
-                continue
-            if sub_paths and not name.startswith(needle):
+    for path_data in paths.values():
+        for method, op_data in path_data.items():
+            if method not in OPERATION_METHODS:
                 continue
-        result[path] = path_data
+            for tag in op_data.get(tags_key) or ():
+                result.setdefault(tag, []).append(op_data.get(op_id_key))
 
     return result
 
 
+def find_paths(paths: dict[str, Any], search: Optional[str] = None, sub_paths: bool = False) -> dict[str, Any]:
+    """Search the 'paths' dictionary for path names including the 'search' string (if provided)."""
+    needle = None if search is None else search.lower().rstrip("/")
+    if not needle:
+        return dict(paths)
+
+    # pick the comparison once, instead of checking the options for every path
+    if sub_paths:
+        return {k: v for k, v in paths.items() if k.lower().rstrip("/").startswith(needle)}
+    return {k: v for k, v in paths.items() if k.lower().rstrip("/") == needle}
+
+
 def remove_schema_tags(schema: dict[str, Any]) -> dict[str, Any]:
     """Remove all 'tags' from the output schema.
 
@@ -355,42 +594,48 @@ def remove_schema_tags(schema: dict[str, Any]) -> dict[str, Any]:
     extra classes to be required for only a handful of operations. For this reason, it can be
     useful to remove the tags to reduce the number of client classes.
     """
-    result = deepcopy(schema)  # copy to make non-destructive
-
-    # "tags" are in the operation data -- using a blind dict could cause properties named "tags" to get removed
-    paths = result.get(OasField.PATHS, {})
-    for path_data in paths.values():
-        for op_data in path_data.values():
-            # NOTE: parameters are a list, not a dict
-            if not isinstance(op_data, dict):
-                continue
-            op_data.pop(OasField.TAGS, None)
+    # non-destructive: only the path items are copied (without any tags), the rest is shared with 'schema'
+    tags_key = OasField.TAGS.value
+    paths_key = OasField.PATHS.value
 
     # plus, there may be top-level tags with a description
-    result.pop(OasField.TAGS, None)
+    result = {k: v for k, v in schema.items() if k != tags_key}
+
+    # "tags" are in the operation data -- using a blind dict could cause properties named "tags" to get removed
+    if paths_key in result:
+        result[paths_key] = {
+            path: {
+                # NOTE: parameters are a list, not a dict
+                key: {k: v for k, v in value.items() if k != tags_key} if isinstance(value, dict) else value
+                for key, value in path_data.items()
+            }
+            for path, path_data in result[paths_key].items()
+        }
 
     return result
 
 
+def _includes_null(types: Union[str, list[str]]) -> bool:
+    """Determine if the 'type' value includes a null type."""
+    if isinstance(types, str) and types in NULL_TYPES:
+        return True
+    return any(x in types for x in NULL_TYPES)
+
+
 def _is_nullable(prop_data: dict[str, Any]) -> bool:
     """Determine if a property is nullable."""
     # this handles the OAS 3.0 style where it is denoted by a `nullable: true`
-    if prop_data.get(OasField.NULLABLE, False):
+    if prop_data.get(_NULLABLE_KEY, False):
         return True
 
-    def _includes_null(types: Union[str, list[str]]) -> bool:
-        if isinstance(types, str) and types in NULL_TYPES:
-            return True
-        return any(x in types for x in NULL_TYPES)
-
     # this handles the OAS 3.1 style where the `type` field has a `null` value
-    if _includes_null(prop_data.get(OasField.TYPE, [])):
+    if _includes_null(prop_data.get(_TYPE_KEY, [])):
         return True
 
     # iterate through all the options in anyOf/oneOf
-    for tag in [OasField.ANY_OF, OasField.ONE_OF]:
+    for tag in _NULLABLE_OPTIONS:
         for item in prop_data.get(tag, []):
-            if _includes_null(item.get(OasField.TYPE, [])):
+            if _includes_null(item.get(_TYPE_KEY, [])):
                 return True
 
     return False
@@ -442,20 +687,31 @@ def set_nullable_not_required(schema: dict[str, Any]) -> dict[str, Any]:
         - name
 
     """
-    result = deepcopy(schema)
-
-    schemas = result.get(OasField.COMPONENTS, {}).get(OasField.SCHEMAS, {})
-    for schema_value in schemas.values():
-        required = schema_value.pop(OasField.REQUIRED, None)
-        if not required:
+    # non-destructive: only the schemas with a 'required' list are copied, the rest is shared with 'schema'
+    required_key = OasField.REQUIRED.value
+    components_key = OasField.COMPONENTS.value
+    schemas_key = OasField.SCHEMAS.value
+
+    result = dict(schema)
+    components = result.get(components_key, {})
+    if schemas_key not in components:
+        return result
+
+    schemas = {}
+    for name, schema_value in components[schemas_key].items():
+        if required_key not in schema_value:
+            schemas[name] = schema_value
             continue
-        required = set(required)
+
+        required = set(schema_value.get(required_key) or ())
+        schema_value = schemas[name] = {k: v for k, v in schema_value.items() if k != required_key}
         for prop_name, prop_data in schema_value.get(OasField.PROPS, {}).items():
             if _is_nullable(prop_data) and prop_name in required:
                 required.remove(prop_name)
         if required:
-            schema_value[OasField.REQUIRED.value] = sorted(required)
+            schema_value[required_key] = sorted(required)
 
+    result[components_key] = {**components, schemas_key: schemas}
     return result
 
 
@@ -470,48 +726,49 @@ def schema_operations_filter(
     'listPets' operation would remove the '#/components/schemas/Pets' object that was only
     used by that operation.
     """
-    result = deepcopy(schema)
-
-    op_map = map_operations(result.pop(OasField.PATHS, {}))
+    # the operations are only copied once they are known to be kept
+    source_paths = schema.get(OasField.PATHS, {})
+    entries = _operation_entries(source_paths)
 
     # make sure all operation_names are in the OAS
     if remove:
-        missing_ops = remove - op_map.keys()
+        missing_ops = remove - entries.keys()
         if missing_ops:
             raise ValueError(f"schema is missing: {', '.join(missing_ops)}")
     else:
-        missing_ops = allow - op_map.keys()
+        missing_ops = allow - entries.keys()
         if missing_ops:
             raise ValueError(f"schema is missing: {', '.join(missing_ops)}")
 
         # create the list of operations to remove
-        remove = op_map.keys() - allow
+        remove = entries.keys() - allow
 
-    # remove the specified operations from the operations map
-    for op_name in remove:
-        op_map.pop(op_name)
+    # copy the rest of the schema (the paths get re-constructed below)
+    paths_key = OasField.PATHS.value
+    result = {k: clone_data(v) for k, v in schema.items() if k != paths_key}
 
-    # reconstruct the paths
+    # reconstruct the paths from the remaining operations
     paths = {}
-    for op_data in op_map.values():
-        path = op_data.pop(OasField.X_PATH)
-        params = op_data.pop(OasField.X_PATH_PARAMS, None)
-        method = op_data.pop(OasField.X_METHOD)
-        orig = paths.get(path, {})
-        if params and OasField.PARAMS not in orig:
-            orig[OasField.PARAMS.value] = params
-        orig[method] = op_data
-        paths[path] = orig
-    result[OasField.PATHS.value] = paths
+    kept_ops = []
+    for op_name, (path, method, op_data) in entries.items():
+        if op_name in remove:
+            continue
+        orig = paths.get(path)
+        if orig is None:
+            # keep the path-item fields (e.g. parameters, summary, servers, extensions)
+            orig = paths[path] = {
+                key: clone_data(value)
+                for key, value in source_paths[path].items()
+                if key not in OPERATION_METHODS
+            }
+        op_data = orig[method] = clone_data(op_data)
+        kept_ops.append(op_data)
+    result[paths_key] = paths
 
     # figure out all the models that are referenced from the remaining operations
-    op_refs = find_references(op_map)
+    op_refs = find_references(paths)
     models = map_models(result.pop(OasField.COMPONENTS, {}))
-    model_refs = {
-        name: find_references(model)
-        for name, model in models.items()
-    }
-    used_models = unroll(model_refs, op_refs)
+    used_models = unroll_models(models, op_refs)
     models = {
         name: value for name, value in models.items()
         if name in used_models
@@ -520,9 +777,7 @@ def schema_operations_filter(
     result[OasField.COMPONENTS.value] = unmap_models(models)
 
     # compile a list of tags that are used
-    used_tags = set()
-    for op_data in op_map.values():
-        used_tags.update(set(op_data.get(OasField.TAGS, [])))
+    used_tags = set(chain.from_iterable(op_data.get(OasField.TAGS) or () for op_data in kept_ops))
 
     # remove unused tags from top-level schema
     tag_defs = result.pop(OasField.TAGS, None)
@@ -536,49 +791,48 @@ def schema_operations_filter(
 
 def map_content_types(schema: dict[str, Any]) -> dict[str, set]:
     """Get map of content-types to operation-id's."""
+    # plain strings (instead of enum lookups) for the per-operation keys
+    op_id_key = OasField.OP_ID.value
+    responses_key = OasField.RESPONSES.value
+    content_key = OasField.CONTENT.value
+
     content = {}
     for path_data in schema.get(OasField.PATHS, {}).values():
         for method, op_data in path_data.items():
-            if method == OasField.PARAMS:
+            if method not in OPERATION_METHODS:
                 continue
 
-            op_id = op_data.get(OasField.OP_ID)
-            for resp_data in op_data.get(OasField.RESPONSES, {}).values():
-                for content_type in resp_data.get(OasField.CONTENT, {}).keys():
-                    items = content.get(content_type, set())
-                    items.add(op_id)
-                    content[content_type] = items
+            op_id = op_data.get(op_id_key)
+            for resp_data in op_data.get(responses_key, {}).values():
+                for content_type in resp_data.get(content_key, {}).keys():
+                    content.setdefault(content_type, set()).add(op_id)
 
     return content
 
 
-def remove_property(schema: dict[str, Any], prop_name: str) -> dict[str, Any]:
-    """Recursively remove any property matching this name."""
-    result = deepcopy(schema)
-    if isinstance(result, dict):
-        result.pop(prop_name, None)
-        dead_keys = set()
-        for key, value in result.items():
-            if not value:
-                continue
+def _remove_property(data: Any, prop_name: str) -> Any:
+    """Remove any property matching this name from the data (in place), and return the data."""
+    if isinstance(data, dict):
+        data.pop(prop_name, None)
+        dead_keys = [
+            key
+            for key, value in data.items()
+            if value and not _remove_property(value, prop_name)
+        ]
+        for key in dead_keys:
+            data.pop(key)
 
-            v = remove_property(value, prop_name)
-            if not v:
-                dead_keys.add(key)
-                continue
+    elif isinstance(data, list):
+        for item in data:
+            if item:
+                _remove_property(item, prop_name)
 
-            result[key] = v
+    return data
 
-        for key in dead_keys:
-            result.pop(key)
 
-    elif isinstance(result, list):
-        temp = []
-        for item in result:
-            if not item:
-                temp.append(item)
-                continue
-            temp.append(remove_property(item, prop_name))
-        result = temp
+def remove_property(schema: dict[str, Any], prop_name: str) -> dict[str, Any]:
+    """Recursively remove any property matching this name.
 
-    return result
+    The schema is copied once, and the copy is updated in place (instead of copying at every level).
+    """
+    return _remove_property(clone_data(schema), prop_name)
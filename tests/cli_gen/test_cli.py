@@ -17,6 +17,7 @@ from openapi_spec_tools.cli_gen.cli import layout_check_format
 from openapi_spec_tools.cli_gen.cli import layout_operations
 from openapi_spec_tools.cli_gen.cli import layout_tree
 from openapi_spec_tools.cli_gen.cli import layout_tree_with_error_handling
+from openapi_spec_tools.cli_gen.cli import load_oas_with_error_handling
 from openapi_spec_tools.cli_gen.cli import open_layout_with_error_handling
 from openapi_spec_tools.cli_gen.cli import open_oas_with_error_handling
 from openapi_spec_tools.cli_gen.cli import show_cli_tree
@@ -55,6 +56,26 @@ def test_open_oas(filename, message) -> None:
     assert output.startswith(message)
 
 
+@pytest.mark.parametrize(
+    ["filename", "message"],
+    [
+        pytest.param("gone", "ERROR: failed to find", id="missing"),
+        pytest.param("bad.json", "ERROR: unable to parse", id="bad-json"),
+        pytest.param("bad.yaml", "ERROR: unable to parse", id="bad-yaml"),
+    ]
+)
+def test_load_oas(filename, message) -> None:
+    with (
+        mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout,
+        pytest.raises(typer.Exit) as err,
+    ):
+        load_oas_with_error_handling(asset_filename(filename))
+
+    assert err.value.exit_code == 1
+    output = mock_stdout.getvalue()
+    assert output.startswith(message)
+
+
 @pytest.mark.parametrize(
     ["filename", "message"],
     [
@@ -574,6 +595,7 @@ def test_cli_generate_failure():
 Commands with missing operations:
     owners: createOwner, deleteOwner, listOwnerPets, updateOwner
     pets: deletePetById
+    pets_examine: checkPetBloodPressure, checkPetHeartRate
     veterinarians: createVet, deleteVet
 """
 
@@ -594,6 +616,7 @@ def test_cli_check_failure():
 Commands with missing operations:
     owners: createOwner, deleteOwner, listOwnerPets, updateOwner
     pets: deletePetById
+    pets_examine: checkPetBloodPressure, checkPetHeartRate
     veterinarians: createVet, deleteVet
 """
 
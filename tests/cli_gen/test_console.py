@@ -27,3 +27,13 @@ def test_console_factory_unspecified():
         console = console_factory()
     # not really a hard value -- it is just something other than the test
     assert console.width != TEST_TERMINAL_WIDTH
+
+
+def test_console_factory_env_changed():
+    console = console_factory()
+    assert console.width == TEST_TERMINAL_WIDTH
+
+    # changes to the environment are picked up by the next console
+    with mock.patch.dict(os.environ, {"TERMINAL_WIDTH": "33"}):
+        console = console_factory()
+    assert console.width == 33
@@ -1,6 +1,8 @@
+import os
 from datetime import datetime
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest import mock
 
 import pytest
 
@@ -43,6 +45,7 @@ def test_generate_node_single():
     path = Path(directory.name)
     file = path / "main.py"
     assert file.exists()
+    assert os.access(file, os.X_OK)
 
     text = file.read_text()
     assert "#!/usr/bin/env python3" in text
@@ -125,6 +128,63 @@ def test_generate_node_multiple():
             assert v in text
 
 
+def test_generate_node_executable():
+    oas = open_oas(asset_filename("pet2.yaml"))
+    tree = file_to_tree(asset_filename("layout_pets.yaml"))
+    generator = Generator("cli_pkg", oas)
+    directory = TemporaryDirectory()
+    existing = Path(directory.name) / "main.py"
+    existing.write_text("")
+    existing.chmod(0o644)
+
+    # the modules are executable regardless of the umask, or whether they already existed
+    umask = os.umask(0o077)
+    try:
+        generate_node(generator, tree, directory.name)
+    finally:
+        os.umask(umask)
+
+    modes = {p.name: p.stat().st_mode & 0o777 for p in Path(directory.name).iterdir()}
+    assert "main.py" in modes
+    assert {0o755} == set(modes.values())
+
+
+def test_generate_node_duplicate():
+    oas = open_oas(asset_filename("pets_and_vets.yaml"))
+    tree = file_to_tree(asset_filename("layout_pets2.yaml"))
+    vets = next(n for n in tree.subcommands() if n.identifier == "veterinarians")
+    vets.identifier = "pets"
+    generator = Generator("cli_pkg", oas)
+    directory = TemporaryDirectory()
+
+    with pytest.raises(ValueError, match="duplicate module name: pets"):
+        generate_node(generator, tree, directory.name)
+
+    # nothing written when the modules collide
+    assert [] == list(Path(directory.name).iterdir())
+
+
+def test_generate_node_failure():
+    oas = open_oas(asset_filename("pets_and_vets.yaml"))
+    tree = file_to_tree(asset_filename("layout_pets2.yaml"))
+    generator = Generator("cli_pkg", oas)
+    directory = TemporaryDirectory()
+
+    def _function_definition(command):
+        if command.identifier == "deleteVet":
+            raise ValueError("bad op")
+        return ""
+
+    with (
+        mock.patch.object(generator, "function_definition", side_effect=_function_definition),
+        pytest.raises(ValueError, match="bad op"),
+    ):
+        generate_node(generator, tree, directory.name)
+
+    # nothing written when any module fails
+    assert [] == list(Path(directory.name).iterdir())
+
+
 def test_generate_node_skip_bugged():
     pkg_name = "cli_pkg"
     oas = open_oas(asset_filename("pets_and_vets.yaml"))
@@ -197,6 +257,7 @@ def test_generate_tree_node(oas_filename, layout_filename, expected):
             {
                 'owners': ['createOwner', 'deleteOwner', 'listOwnerPets', 'updateOwner'],
                 'pets': ['deletePetById'],
+                'pets_examine': ['checkPetBloodPressure', 'checkPetHeartRate'],
                 'veterinarians': ['createVet', 'deleteVet'],
             },
             id="missing",
@@ -1,5 +1,8 @@
+import dataclasses
+
 import pytest
 
+from openapi_spec_tools.cli_gen._tree import DATACLASS_SLOTS
 from openapi_spec_tools.cli_gen.layout import check_pagination_definitions
 from openapi_spec_tools.cli_gen.layout import data_to_node
 from openapi_spec_tools.cli_gen.layout import field_to_list
@@ -13,8 +16,10 @@ from openapi_spec_tools.cli_gen.layout import parse_to_tree
 from openapi_spec_tools.cli_gen.layout import subcommand_missing_properties
 from openapi_spec_tools.cli_gen.layout import subcommand_order
 from openapi_spec_tools.cli_gen.layout import subcommand_references
+from openapi_spec_tools.cli_gen.layout import validate_subcommands
 from openapi_spec_tools.cli_gen.layout_types import LayoutNode
 from openapi_spec_tools.cli_gen.layout_types import PaginationNames
+from openapi_spec_tools.cli_gen.layout_types import SubcommandErrors
 from tests.helpers import asset_filename
 
 OPS = "operations"
@@ -445,6 +450,19 @@ def test_pagination_definitions(data, expected) -> None:
     assert expected == check_pagination_definitions(data)
 
 
+def test_validate_subcommands() -> None:
+    data = open_layout(asset_filename("layout_bad.yaml"))
+    errors = validate_subcommands(data)
+    assert subcommand_missing_properties(data) == errors.missing_properties
+    assert operation_duplicates(data) == errors.duplicates
+    assert operation_order(data) == errors.order
+    assert check_pagination_definitions(data) == errors.pagination
+    assert errors != SubcommandErrors()
+
+    disabled = validate_subcommands(data, missing_props=False, op_dups=False, op_order=False, pagination=False)
+    assert SubcommandErrors() == disabled
+
+
 def test_lists() -> None:
     uut = LayoutNode(
         command="top",
@@ -472,6 +490,7 @@ def test_lists() -> None:
     operations = uut.operations()
     assert 1 == len(operations)
     assert "zey" == operations[0].command
+    assert (subcommands, operations) == uut.partition()
 
 
 def test_lists_bugged() -> None:
@@ -509,6 +528,8 @@ def test_lists_bugged() -> None:
     assert 1 == len(subcommands)
     operations = uut.operations(include_bugged=True)
     assert 1 == len(operations)
+    assert (subcommands, operations) == uut.partition(include_bugged=True)
+    assert ([], []) == uut.partition()
 
 
 def test_file_to_tree() -> None:
@@ -522,6 +543,31 @@ def test_file_to_tree() -> None:
     assert set() == {p.command for p in tree.subcommands()}
 
 
+@pytest.mark.skipif(not DATACLASS_SLOTS, reason="dataclass slots require Python 3.10+")
+def test_layout_node_slots() -> None:
+    node = LayoutNode(command="foo", identifier="bar", pagination=PaginationNames())
+    assert not hasattr(node, "__dict__")
+    assert not hasattr(node.pagination, "__dict__")
+    with pytest.raises(AttributeError):
+        node.bogus = "value"
+
+
+def test_as_dict() -> None:
+    tree = file_to_tree(asset_filename("layout_pets2.yaml"))
+    tree.pagination = PaginationNames(page_size="limit")
+    tree.extra = {"foo": {"bar": 1}}
+
+    assert dataclasses.asdict(tree) == tree.as_dict(sparse=False)
+
+    data = tree.as_dict()
+    assert {"page_size": "limit"} == data["pagination"]
+    assert {"foo": {"bar": 1}} == data["extra"]
+    child = data["children"][0]
+    assert {"command", "identifier", "description", "children"} == child.keys()
+    assert "bugs" not in child
+    assert "pagination" not in child
+
+
 @pytest.mark.parametrize(
     ["search_args", "expected"],
     [
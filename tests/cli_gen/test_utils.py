@@ -42,6 +42,16 @@ def test_camel_case(text, expected):
     assert expected == to_camel_case(text)
 
 
+@pytest.mark.parametrize("func", [to_snake_case, to_camel_case])
+def test_case_conversion_cached(func):
+    func.cache_clear()
+    first = func("someOperation_id")
+    assert first is func("someOperation_id")
+    info = func.cache_info()
+    assert 1 == info.misses
+    assert 1 == info.hits
+
+
 @pytest.mark.parametrize(
     ["item", "expected"],
     [
@@ -8,3 +8,11 @@ def copyright_fixture():
     set_copyright()  # set to default
     yield
     set_copyright() # reset to default
+
+
+@pytest.fixture(autouse=True)
+def spec_cache_dir(tmp_path, monkeypatch):
+    # cache the parsed specs in a per-test directory (caching is opt-in)
+    cache_dir = tmp_path / "spec-cache"
+    monkeypatch.setenv("OAS_CACHE_DIR", cache_dir.as_posix())
+    return cache_dir
@@ -1,3 +1,4 @@
+import json
 import os
 import tempfile
 from pathlib import Path
@@ -7,12 +8,16 @@ from unittest import mock
 
 import pytest
 import typer
+import yaml
 
+from openapi_spec_tools.oas import DisplayFormat
 from openapi_spec_tools.oas import DisplayOption
+from openapi_spec_tools.oas import app
 from openapi_spec_tools.oas import console_factory
 from openapi_spec_tools.oas import content_type_list
 from openapi_spec_tools.oas import diff
 from openapi_spec_tools.oas import info
+from openapi_spec_tools.oas import load_oas_with_error_handling
 from openapi_spec_tools.oas import models_list
 from openapi_spec_tools.oas import models_operations
 from openapi_spec_tools.oas import models_show
@@ -25,8 +30,10 @@ from openapi_spec_tools.oas import operation_show
 from openapi_spec_tools.oas import paths_list
 from openapi_spec_tools.oas import paths_operations
 from openapi_spec_tools.oas import paths_show
+from openapi_spec_tools.oas import print_yaml
 from openapi_spec_tools.oas import remove_dict_prefix
 from openapi_spec_tools.oas import remove_list_prefix
+from openapi_spec_tools.oas import sorted_matches
 from openapi_spec_tools.oas import summary
 from openapi_spec_tools.oas import tags_list
 from openapi_spec_tools.oas import tags_show
@@ -42,10 +49,23 @@ PET3_YAML = asset_filename("pet3.yaml")
 #################################################
 # Utilities
 
+def test_app_commands() -> None:
+    # single 'oas' application, with each command registered once
+    assert ["info", "summary", "diff", "update"] == [c.name for c in app.registered_commands]
+    assert ["analyze"] == [g.name for g in app.registered_groups]
+
+    analyze = app.registered_groups[0].typer_instance
+    assert ["ops", "paths", "models", "tags", "content"] == [g.name for g in analyze.registered_groups]
+    for group in analyze.registered_groups:
+        names = [c.name for c in group.typer_instance.registered_commands]
+        assert len(names) == len(set(names)), f"duplicate commands in {group.name}"
+
+
 def test_console_factory() -> None:
     # when running the tests, the PYTEST_VERSION is defined by default
     console = console_factory()
     assert 3000 == console.width
+    assert not console._highlight
 
     with mock.patch.dict(os.environ, {"TERMINAL_WIDTH": "12"}):
         console = console_factory()
@@ -76,6 +96,25 @@ def test_open_oas(filename, message) -> None:
     assert output.startswith(message)
 
 
+@pytest.mark.parametrize(
+    ["filename", "message"],
+    [
+        pytest.param("gone", "ERROR: failed to find", id="missing"),
+        pytest.param("bad.json", "ERROR: unable to parse", id="bad"),
+    ]
+)
+def test_info_failure(filename, message) -> None:
+    with (
+        mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout,
+        pytest.raises(typer.Exit) as err,
+    ):
+        info(asset_filename(filename))
+
+    assert err.value.exit_code == 1
+    output = mock_stdout.getvalue()
+    assert output.startswith(message)
+
+
 
 #################################################
 # Top-level stuff
@@ -95,6 +134,22 @@ info:
         assert output == expected
 
 
+@pytest.mark.parametrize(
+    ["spec", "expected"],
+    [
+        pytest.param("paths: {}\n", "info: {}\n\n", id="missing"),
+        pytest.param("info: null\npaths: {}\n", "info: null\n\n", id="null"),
+    ]
+)
+def test_info_empty(tmp_path, spec, expected) -> None:
+    filename = (tmp_path / "spec.yaml").as_posix()
+    Path(filename).write_text(spec)
+    with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+        info(filename)
+
+    assert expected == mock_stdout.getvalue()
+
+
 def test_summary() -> None:
     with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
         summary(PET2_YAML)
@@ -116,6 +171,130 @@ OpenAPI spec (pet2.yaml):
 """
         assert output == expected
 
+@pytest.mark.parametrize(
+    ["spec", "expected"],
+    [
+        pytest.param(
+            """\
+paths:
+  /pets:
+    summary: Pets
+    x-internal: true
+    parameters: []
+    get:
+      operationId: listPets
+      tags: [pets, animals]
+    head:
+      operationId: checkPets
+      tags: [pets]
+""",
+            """\
+OpenAPI spec (spec.yaml):
+    Models: 0
+    Paths: 1
+    Operation methods (2):
+        get: 1
+        put: 0
+        patch: 0
+        delete: 0
+        post: 0
+        head: 1
+    Tags (2) with operation counts:
+        pets: 2
+        animals: 1
+""",
+            id="path-item-fields",
+        ),
+        pytest.param(
+            # untagged operations (missing or null tags) are not counted
+            """\
+paths:
+  /pets:
+    get:
+      operationId: listPets
+      tags: [pets]
+    post:
+      operationId: createPet
+      tags: null
+  /pets/{id}:
+    get:
+      operationId: getPet
+    delete:
+      operationId: deletePet
+      tags: [pets, admin]
+""",
+            """\
+OpenAPI spec (spec.yaml):
+    Models: 0
+    Paths: 2
+    Operation methods (4):
+        get: 2
+        put: 0
+        patch: 0
+        delete: 1
+        post: 1
+    Tags (2) with operation counts:
+        pets: 2
+        admin: 1
+""",
+            id="untagged",
+        ),
+    ]
+)
+def test_summary_counts(tmp_path, spec, expected) -> None:
+    filename = (tmp_path / "spec.yaml").as_posix()
+    Path(filename).write_text(spec)
+    with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+        summary(filename)
+
+    assert expected == mock_stdout.getvalue()
+
+def test_print_yaml() -> None:
+    with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+        print_yaml({"description": "[red]not markup[/red] " + "x" * 200, "items": ["a", "b"]}, indent=2)
+
+    expected = f"""\
+description: '[red]not markup[/red] {"x" * 200}'
+items:
+- a
+- b
+
+"""
+    assert expected == mock_stdout.getvalue()
+
+def test_print_yaml_output() -> None:
+    # the output matches the pure-Python dumper (sorted keys, indented), and loads back the same
+    data = {"b": {"z": [1, "two", None], "a": "with: colon"}, "a": [{"y": True, "x": 1.5}]}
+    with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+        print_yaml(data)
+    output = mock_stdout.getvalue()
+    assert yaml.dump(data, Dumper=yaml.SafeDumper, indent=4) + "\n" == output
+    assert data == yaml.safe_load(output)
+    assert output.index("a:") < output.index("b:")
+
+@pytest.mark.parametrize(
+    ["command", "args"],
+    [
+        pytest.param(info, [PET2_YAML], id="info"),
+        pytest.param(diff, [asset_filename("pet.yaml"), PET2_YAML], id="diff"),
+        pytest.param(operation_show, [PET2_YAML, "listPets"], id="ops-show"),
+        pytest.param(paths_show, [PET2_YAML, "/pets"], id="paths-show"),
+        pytest.param(paths_operations, [PET2_YAML, "/pets"], id="paths-operations"),
+        pytest.param(models_show, [PET2_YAML, "Pet"], id="models-show"),
+        pytest.param(update, [PET2_YAML, None, True], id="update-diff"),
+    ]
+)
+def test_yaml_streamed(command, args) -> None:
+    # YAML is streamed to stdout, instead of being built as a string and formatted by the console
+    with (
+        mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout,
+        mock.patch("openapi_spec_tools.oas.console_factory") as mock_console,
+    ):
+        command(*args)
+
+    mock_console.assert_not_called()
+    assert mock_stdout.getvalue()
+
 def test_diff_found() -> None:
     with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
         diff(asset_filename("pet.yaml"), PET2_YAML)
@@ -147,6 +326,37 @@ def test_diff_not_found() -> None:
         expected = "No differences between pet2.yaml and pet2.yaml"
         assert output == expected
 
+def test_diff_same_file_loaded_once() -> None:
+    with (
+        mock.patch('sys.stdout', new_callable=StringIo),
+        mock.patch("openapi_spec_tools.oas.load_oas_cached", return_value=({}, {})) as mock_load,
+    ):
+        diff(PET2_YAML, PET2_YAML)
+
+    mock_load.assert_called_once_with(PET2_YAML)
+
+def test_open_oas_cached(spec_cache_dir) -> None:
+    first = open_oas_with_error_handling(PET2_YAML)
+    assert 1 == len(list(spec_cache_dir.iterdir()))
+
+    with mock.patch("openapi_spec_tools.spec_cache.open_oas") as mock_open:
+        second = open_oas_with_error_handling(PET2_YAML)
+    mock_open.assert_not_called()
+    assert first == second
+
+def test_load_oas_cached_operations(spec_cache_dir) -> None:
+    spec, operations = load_oas_with_error_handling(PET2_YAML)
+    assert {"listPets", "createPets", "showPetById", "deletePetById"} == operations.keys()
+
+    # the operations map comes from the cache, instead of being re-built by the command
+    with (
+        mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout,
+        mock.patch("openapi_spec_tools.spec_cache.map_operations") as mock_map,
+    ):
+        operation_list(PET2_YAML)
+    mock_map.assert_not_called()
+    assert mock_stdout.getvalue().startswith("Found 4 operations:")
+
 PET2_DIFF_TAG_YAML = """\
 paths:
     /pets:
@@ -273,6 +483,35 @@ def test_update_success(filename: str, kwargs: dict[str, Any], expected: str) ->
         output = mock_stdout.getvalue()
         assert output == expected
 
+@pytest.mark.parametrize("display_option", [DisplayOption.NONE, DisplayOption.FINAL])
+def test_update_display_skips_diffs(display_option: DisplayOption) -> None:
+    with (
+        mock.patch('sys.stdout', new_callable=StringIo),
+        mock.patch("openapi_spec_tools.oas.find_diffs") as mock_diffs,
+    ):
+        update(PET2_YAML, remove_all_tags=True, display_option=display_option)
+    mock_diffs.assert_not_called()
+
+def test_update_no_transforms() -> None:
+    with (
+        mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout,
+        mock.patch("openapi_spec_tools.oas.find_diffs") as mock_diffs,
+    ):
+        update(PET2_YAML, display_option=DisplayOption.SUMMARY)
+    mock_diffs.assert_not_called()
+    assert mock_stdout.getvalue() == "No differences between pet2.yaml and updated\n"
+
+def test_update_json_format() -> None:
+    with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+        update(PET2_YAML, remove_all_tags=True, display_format=DisplayFormat.JSON, indent=2)
+    assert json.loads(mock_stdout.getvalue()) == yaml.safe_load(PET2_DIFF_TAG_YAML)
+
+    with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+        update(PET2_YAML, display_option=DisplayOption.FINAL, display_format=DisplayFormat.JSON)
+    output = mock_stdout.getvalue()
+    assert output.startswith('{\n    "openapi": "3.0.0",')
+    assert json.loads(output) == yaml.safe_load(Path(PET2_YAML).read_text())
+
 def test_update_success_save() -> None:
     with (
         mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout,
@@ -288,17 +527,25 @@ def test_update_success_save() -> None:
         )
         output = mock_stdout.getvalue()
         assert temp_file.exists()
-        expected = temp_file.read_text() + "\n"
-        assert output == expected
+        saved = temp_file.read_text()
+        assert yaml.safe_load(saved) == yaml.safe_load(output)
+
+        # file keeps the original key order, while the display is sorted
+        assert list(yaml.safe_load(saved).keys())[:3] == ["openapi", "info", "servers"]
+        assert output.startswith("components:\n")
 
 
 def test_update_failure() -> None:
-    with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+    with (
+        mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout,
+        mock.patch("openapi_spec_tools.oas.load_oas_cached") as mock_load,
+    ):
         with pytest.raises(typer.Exit) as err:
             update(PET2_YAML, allowed_operations=["listPets"], remove_operations=["deletePetById"])
         assert err.value.exit_code == 1
         output = mock_stdout.getvalue()
         assert output == "ERROR: cannot specify both --allow-op and --remove-op\n"
+    mock_load.assert_not_called()
 
 
 ##########################################
@@ -407,6 +654,19 @@ def test_operation_show_success(filename, operation, expected) -> None:
         assert output == expected
 
 
+def test_operation_show_repeated(spec_cache_dir) -> None:
+    # each command gets its own operations map, so showing an operation (which pops the x- fields)
+    # does not affect later commands in the same process
+    outputs = []
+    for _ in range(2):
+        with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+            operation_show(PET2_YAML, "listPets")
+        outputs.append(mock_stdout.getvalue())
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0].startswith("/pets:\n")
+
+
 def test_operation_show_failure() -> None:
     with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
         search = "missingPets"
@@ -801,6 +1061,32 @@ def test_models_used_by_success(filename: str, model: str, expected: str) -> Non
         assert output == expected
 
 
+@pytest.mark.parametrize(
+    ["command", "args"],
+    [
+        pytest.param(models_uses, [PET_YAML, "Pets"], id="models-uses"),
+        pytest.param(models_used_by, [PET_YAML, "Pet"], id="models-used-by"),
+        pytest.param(tags_list, [PET2_YAML], id="tags-list"),
+        pytest.param(tags_show, [PET2_YAML, "pets"], id="tags-show"),
+    ]
+)
+def test_derived_data_cached(command, args) -> None:
+    with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+        command(*args)
+    expected = mock_stdout.getvalue()
+
+    # repeated queries only need the cached model references/tags, not the spec
+    with (
+        mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout,
+        mock.patch("openapi_spec_tools.spec_cache.open_oas") as mock_open,
+        mock.patch("openapi_spec_tools.spec_cache.load_oas_cached") as mock_load,
+    ):
+        command(*args)
+    assert expected == mock_stdout.getvalue()
+    mock_open.assert_not_called()
+    mock_load.assert_not_called()
+
+
 def test_models_used_by_failure() -> None:
     with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
         search = "Dog"
@@ -881,6 +1167,24 @@ def test_tags_show_failure() -> None:
         assert output == f"ERROR: failed to find {search}\n"
 
 
+def test_tags_untagged_operations(tmp_path) -> None:
+    filename = (tmp_path / "untagged.yaml").as_posix()
+    Path(filename).write_text("""\
+paths:
+  /pets:
+    get:
+      operationId: listPets
+      tags: [pets]
+    post:
+      operationId: createPet
+""")
+    with mock.patch('sys.stdout', new_callable=StringIo) as mock_stdout:
+        tags_list(filename)
+        tags_show(filename, "pets")
+
+    assert "Found 1 tags:\n    pets\nTag pets has 1 operations:\n    listPets\n" == mock_stdout.getvalue()
+
+
 ##########################################
 # Content
 @pytest.mark.parametrize(
@@ -903,6 +1207,13 @@ def test_tags_show_failure() -> None:
             id="max-size",
         ),
         pytest.param(PET2_YAML, None, "application/yaml", "No content-types found\n", id="not-found"),
+        pytest.param(
+            PET2_YAML,
+            1,
+            "application/json",
+            "application/json\n    createPets\n    ...\n    + 3 more\n",
+            id="found",
+        ),
     ]
 )
 def test_content_type_list(filename, max_size, content_type, expected) -> None:
@@ -932,6 +1243,20 @@ def test_remove_list_prefix(items, expected) -> None:
     assert expected == remove_list_prefix(items)
 
 
+@pytest.mark.parametrize(
+    ["names", "search", "expected"],
+    [
+        pytest.param({"b", "a", "C"}, None, ["C", "a", "b"], id="no-search"),
+        pytest.param({"listPets", "createPet", "listVets"}, "LIST", ["listPets", "listVets"], id="case"),
+        pytest.param({"listPets"}, "owner", [], id="none"),
+        pytest.param(set(), "pet", [], id="empty"),
+        pytest.param((n for n in ["showPet", "listPets"]), "PET", ["listPets", "showPet"], id="iterator"),
+    ]
+)
+def test_sorted_matches(names, search, expected) -> None:
+    assert expected == sorted_matches(names, search)
+
+
 @pytest.mark.parametrize(
     ["map", "expected"],
     [
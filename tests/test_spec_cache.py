@@ -0,0 +1,220 @@
+import os
+import shutil
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import yaml
+
+from openapi_spec_tools.spec_cache import cache_directory
+from openapi_spec_tools.spec_cache import cache_filename
+from openapi_spec_tools.spec_cache import load_model_references_cached
+from openapi_spec_tools.spec_cache import load_oas_cached
+from openapi_spec_tools.spec_cache import load_tags_cached
+from openapi_spec_tools.types import OasField
+from openapi_spec_tools.utils import map_models
+from openapi_spec_tools.utils import map_operations
+from openapi_spec_tools.utils import map_tags
+from openapi_spec_tools.utils import model_references
+from openapi_spec_tools.utils import open_oas
+from tests.helpers import asset_filename
+
+
+def test_cache_directory(monkeypatch) -> None:
+    monkeypatch.setenv("OAS_CACHE_DIR", "/my/cache")
+    assert Path("/my/cache") == cache_directory()
+
+    monkeypatch.setenv("OAS_CACHE_DIR", "")
+    assert cache_directory() is None
+
+    # caching is opt-in
+    monkeypatch.delenv("OAS_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", "/xdg")
+    assert cache_directory() is None
+
+
+def test_load_oas_cached(spec_cache_dir) -> None:
+    filename = asset_filename("pet.yaml")
+    expected = open_oas(filename)
+
+    oas, operations = load_oas_cached(filename)
+    assert expected == oas
+    assert map_operations(expected.get(OasField.PATHS)) == operations
+    cache_file = cache_filename(filename)
+    assert cache_file.parent == spec_cache_dir
+    assert cache_file.exists()
+
+    # second time comes from the cache
+    with mock.patch("openapi_spec_tools.spec_cache.open_oas") as mock_open:
+        cached_oas, cached_operations = load_oas_cached(filename)
+    mock_open.assert_not_called()
+    assert expected == cached_oas
+    assert operations == cached_operations
+
+
+def test_load_oas_cached_location(tmp_path, spec_cache_dir) -> None:
+    # the cache lives in the cache directory, and never next to the specification
+    spec_dir = tmp_path / "specs"
+    spec_dir.mkdir()
+    filename = (spec_dir / "spec.yaml").as_posix()
+    shutil.copyfile(asset_filename("pet.yaml"), filename)
+    load_oas_cached(filename)
+
+    assert [Path(filename)] == list(spec_dir.iterdir())
+    assert 1 == len(list(spec_cache_dir.iterdir()))
+
+
+def test_load_oas_cached_modified(tmp_path, spec_cache_dir) -> None:
+    filename = (tmp_path / "spec.yaml").as_posix()
+    shutil.copyfile(asset_filename("pet.yaml"), filename)
+    original = cache_filename(filename)
+    load_oas_cached(filename)
+
+    shutil.copyfile(asset_filename("pets_and_vets.yaml"), filename)
+    os.utime(filename, ns=(0, 0))
+    assert original == cache_filename(filename)
+
+    oas, _ = load_oas_cached(filename)
+    assert open_oas(asset_filename("pets_and_vets.yaml")) == oas
+
+    # the stale entry was replaced
+    assert [original] == list(spec_cache_dir.iterdir())
+    with mock.patch("openapi_spec_tools.spec_cache.open_oas") as mock_open:
+        cached, _ = load_oas_cached(filename)
+    mock_open.assert_not_called()
+    assert oas == cached
+
+
+def test_load_oas_cached_version(monkeypatch, spec_cache_dir) -> None:
+    filename = asset_filename("pet.yaml")
+    load_oas_cached(filename)
+    cache_file = cache_filename(filename)
+
+    # a new cache version ignores the existing entry, and replaces it
+    monkeypatch.setattr("openapi_spec_tools.spec_cache.CACHE_VERSION", 1000)
+    with mock.patch("openapi_spec_tools.spec_cache.open_oas", return_value={}) as mock_open:
+        oas, _ = load_oas_cached(filename)
+    mock_open.assert_called_once()
+    assert {} == oas
+    assert [cache_file] == list(spec_cache_dir.iterdir())
+
+
+def test_load_oas_cached_corrupt() -> None:
+    filename = asset_filename("pet.yaml")
+    cache_file = cache_filename(filename)
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_bytes(b"not a pickle")
+
+    # the unreadable entry is removed, even when it cannot be re-built
+    with mock.patch("openapi_spec_tools.spec_cache.open_oas", side_effect=ValueError("bad spec")):
+        with pytest.raises(ValueError):
+            load_oas_cached(filename)
+    assert not cache_file.exists()
+
+    oas, _ = load_oas_cached(filename)
+    assert open_oas(filename) == oas
+
+
+def test_load_oas_cached_stale(tmp_path, spec_cache_dir) -> None:
+    filename = (tmp_path / "spec.yaml").as_posix()
+    shutil.copyfile(asset_filename("pet.yaml"), filename)
+    load_oas_cached(filename)
+    cache_file = cache_filename(filename)
+    assert cache_file.exists()
+
+    # the stale entry is removed, even though the updated specification fails to parse
+    Path(filename).write_text("info: [\n")
+    os.utime(filename, ns=(0, 0))
+    with pytest.raises(yaml.YAMLError):
+        load_oas_cached(filename)
+    assert [] == list(spec_cache_dir.iterdir())
+
+
+def test_load_oas_cached_private(spec_cache_dir) -> None:
+    filename = asset_filename("pet.yaml")
+    load_oas_cached(filename)
+    cache_file = cache_filename(filename)
+    assert 0o600 == cache_file.stat().st_mode & 0o777
+    assert 0o700 == spec_cache_dir.stat().st_mode & 0o777
+
+    # files others could have written are never unpickled (or removed)
+    cache_file.chmod(0o620)
+    with (
+        mock.patch("openapi_spec_tools.spec_cache.pickle.loads") as mock_loads,
+        mock.patch("openapi_spec_tools.spec_cache._write_cache") as mock_write,
+    ):
+        oas, _ = load_oas_cached(filename)
+    mock_loads.assert_not_called()
+    mock_write.assert_called_once()
+    assert open_oas(filename) == oas
+    assert cache_file.exists()
+
+    cache_file.chmod(0o600)
+    with mock.patch("os.getuid", return_value=os.getuid() + 1):
+        with mock.patch("openapi_spec_tools.spec_cache.pickle.loads") as mock_loads:
+            load_oas_cached(filename)
+    mock_loads.assert_not_called()
+
+
+def test_load_oas_cached_rewritten(tmp_path, spec_cache_dir) -> None:
+    filename = (tmp_path / "spec.yaml").as_posix()
+    Path(filename).write_text("info: {title: One}\n")
+    os.utime(filename, ns=(0, 0))
+    load_oas_cached(filename)
+
+    # same size and modification time, but the replaced file (e.g. saved by an editor) is a new inode
+    new_file = tmp_path / "spec.new"
+    new_file.write_text("info: {title: Two}\n")
+    os.utime(new_file, ns=(0, 0))
+    os.replace(new_file, filename)
+    oas, _ = load_oas_cached(filename)
+    assert {"info": {"title": "Two"}} == oas
+
+
+def test_load_model_references_cached(spec_cache_dir) -> None:
+    filename = asset_filename("pet2.yaml")
+    expected = model_references(map_models(open_oas(filename).get(OasField.COMPONENTS)))
+    assert expected == load_model_references_cached(filename)
+    # cached separately from the spec
+    assert 2 == len(list(spec_cache_dir.iterdir()))
+
+    # the cached references do not need the spec
+    with mock.patch("openapi_spec_tools.spec_cache.load_oas_cached") as mock_load:
+        assert expected == load_model_references_cached(filename)
+    mock_load.assert_not_called()
+
+    with pytest.raises(FileNotFoundError):
+        load_model_references_cached(asset_filename("gone"))
+
+
+def test_load_tags_cached(spec_cache_dir) -> None:
+    filename = asset_filename("pet2.yaml")
+    expected = map_tags(open_oas(filename).get(OasField.PATHS))
+    assert expected == load_tags_cached(filename)
+
+    with mock.patch("openapi_spec_tools.spec_cache.load_oas_cached") as mock_load:
+        assert expected == load_tags_cached(filename)
+    mock_load.assert_not_called()
+
+    with pytest.raises(FileNotFoundError):
+        load_tags_cached(asset_filename("gone"))
+
+
+def test_load_oas_cached_disabled(monkeypatch, spec_cache_dir) -> None:
+    monkeypatch.setenv("OAS_CACHE_DIR", "")
+    filename = asset_filename("pet.yaml")
+    with mock.patch("openapi_spec_tools.spec_cache.pickle") as mock_pickle:
+        oas, _ = load_oas_cached(filename)
+    assert open_oas(filename) == oas
+    assert not spec_cache_dir.exists()
+
+    # nothing is pickled, so every load parses the specification
+    assert not mock_pickle.method_calls
+    with mock.patch("openapi_spec_tools.spec_cache.open_oas", return_value={}) as mock_open:
+        load_oas_cached(filename)
+    mock_open.assert_called_once()
+
+
+def test_load_oas_cached_missing() -> None:
+    with pytest.raises(FileNotFoundError):
+        load_oas_cached(asset_filename("gone"))
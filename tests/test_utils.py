@@ -1,9 +1,14 @@
+import sys
 from enum import Enum
+from pathlib import Path
 from typing import Any
+from unittest import mock
 
 import pytest
+import yaml
 
 from openapi_spec_tools.types import OasField
+from openapi_spec_tools.utils import clone_data
 from openapi_spec_tools.utils import count_values
 from openapi_spec_tools.utils import find_diffs
 from openapi_spec_tools.utils import find_paths
@@ -11,16 +16,21 @@ from openapi_spec_tools.utils import find_references
 from openapi_spec_tools.utils import map_content_types
 from openapi_spec_tools.utils import map_models
 from openapi_spec_tools.utils import map_operations
+from openapi_spec_tools.utils import map_tags
 from openapi_spec_tools.utils import model_filter
 from openapi_spec_tools.utils import model_full_name
 from openapi_spec_tools.utils import model_references
 from openapi_spec_tools.utils import models_referenced_by
 from openapi_spec_tools.utils import open_oas
+from openapi_spec_tools.utils import open_oas_section
 from openapi_spec_tools.utils import remove_property
 from openapi_spec_tools.utils import remove_schema_tags
+from openapi_spec_tools.utils import reverse_references
 from openapi_spec_tools.utils import schema_operations_filter
 from openapi_spec_tools.utils import set_nullable_not_required
 from openapi_spec_tools.utils import short_ref
+from openapi_spec_tools.utils import unroll
+from openapi_spec_tools.utils import unroll_models
 from tests.helpers import asset_filename
 from tests.helpers import open_test_oas
 
@@ -35,6 +45,47 @@ def test_open_oas() -> None:
         open_oas("no-such-file")
 
 
+def test_open_oas_loader(tmp_path) -> None:
+    # the result matches the pure-Python loader, including the order of the keys
+    filename = asset_filename("pet2.yaml")
+    with open(filename, encoding="utf-8") as fp:
+        expected = yaml.load(fp, Loader=yaml.SafeLoader)
+    actual = open_oas(filename)
+    assert expected == actual
+    assert list(expected) == list(actual)
+    assert list(expected["paths"]) == list(actual["paths"])
+
+    # implicit scalar types are resolved the same way
+    scalar_file = tmp_path / "scalars.yaml"
+    scalar_file.write_text("b: 1.5\na: [yes, no, null, ~, 0x10, '007', 2025-01-02]\nc: {z: 1, y: 2}\n")
+    expected = yaml.safe_load(scalar_file.read_text())
+    actual = open_oas(str(scalar_file))
+    assert expected == actual
+    assert ["b", "a", "c"] == list(actual)
+    assert ["z", "y"] == list(actual["c"])
+
+
+def test_open_oas_json_content(tmp_path) -> None:
+    pet_json = open_oas(asset_filename("pet2.json"))
+
+    # JSON content with a YAML filename uses the JSON parser
+    json_file = tmp_path / "pet2.yaml"
+    json_file.write_text(Path(asset_filename("pet2.json")).read_text())
+    with mock.patch("openapi_spec_tools.utils.yaml.load") as mock_load:
+        assert open_oas(str(json_file)) == pet_json
+    mock_load.assert_not_called()
+
+    # YAML content is parsed from the file, instead of reading it all into a string first
+    with mock.patch("openapi_spec_tools.utils.yaml.load") as mock_load:
+        open_oas(asset_filename("pet2.yaml"))
+    assert not isinstance(mock_load.call_args.args[0], str)
+
+    # YAML flow-style content that is not valid JSON falls back to the YAML parser
+    flow_file = tmp_path / "flow.yaml"
+    flow_file.write_text("{openapi: 3.0.0, info: {title: flow}}\n")
+    assert open_oas(str(flow_file)) == {"openapi": "3.0.0", "info": {"title": "flow"}}
+
+
 @pytest.mark.parametrize(
     ["full_name", "expected"],
     [
@@ -69,6 +120,16 @@ def test_utils_find_path_references(asset, path, references) -> None:
     assert references == found
 
 
+def test_utils_find_references_nested() -> None:
+    # deeply nested data is walked without recursion
+    data = {"$ref": "#/components/schemas/Bottom"}
+    for index in range(sys.getrecursionlimit() + 10):
+        data = {"allOf": [{"$ref": f"#/components/schemas/Level{index}"}, data]} if index % 2 else {"items": data}
+    found = find_references(data)
+    assert "schemas/Bottom" in found
+    assert "schemas/Level1" in found
+
+
 def test_find_diffs_pet_forward() -> None:
     orig = open_test_oas("pet.yaml")
     updated = open_test_oas("pet2.yaml")
@@ -152,6 +213,34 @@ def test_find_diffs_list_dicts_item() -> None:
     assert 3 == count_values(diff)
 
 
+def test_find_diffs_shared() -> None:
+    shared = {"x": [{"y": 1}], "z": "text"}
+    orig = {"a": shared, "b": "before"}
+    assert {} == find_diffs(orig, orig)
+
+    updated = {"a": shared, "b": "after"}
+    assert {"b": "before != after"} == find_diffs(orig, updated)
+
+
+def test_find_diffs_equal() -> None:
+    # equal (but not shared) values are not walked
+    orig = {"a": {"x": [{"y": 1}], "z": [[1, 2]]}, "b": "before"}
+    updated = {"a": {"x": [{"y": 1}], "z": [[1, 2]]}, "b": "after"}
+    with mock.patch("openapi_spec_tools.utils.find_diffs", wraps=find_diffs) as mock_diffs:
+        assert {"b": "before != after"} == find_diffs(orig, updated)
+    mock_diffs.assert_not_called()
+
+
+def test_find_diffs_type_change() -> None:
+    orig = {"a": {"b": 1}, "c": ["d"], "e": 1}
+    updated = {"a": "text", "c": {"d": 2}, "e": 1.5}
+    assert {
+        "a": "{'b': 1} != text",
+        "c": "['d'] != {'d': 2}",
+        "e": "1 != 1.5",
+    } == find_diffs(orig, updated)
+
+
 @pytest.mark.parametrize(
     ["obj", "count"],
     [
@@ -168,6 +257,29 @@ def test_count_values_success(obj, count) -> None:
     assert count == count_values(obj)
 
 
+def test_count_values_nested() -> None:
+    # deeply nested data is walked without recursion
+    obj = {"a": 1}
+    for _ in range(sys.getrecursionlimit() + 10):
+        obj = {"list": [obj, "text"]}
+    assert sys.getrecursionlimit() + 11 == count_values(obj)
+
+
+def test_count_values_subclasses() -> None:
+    # container subclasses are walked just like the plain containers
+    class MyDict(dict):
+        pass
+
+    class MyList(list):
+        pass
+
+    class MySet(set):
+        pass
+
+    obj = {"d": MyDict(a=1, b=[2, 3]), "l": MyList([1, {"c": "d"}]), "s": MySet({"x", "y"})}
+    assert 7 == count_values(obj)
+
+
 def test_count_values_failure() -> None:
     class MyEnum(Enum):
         A = "a"
@@ -179,6 +291,40 @@ def test_count_values_failure() -> None:
     assert error.match("Unhandled type MyEnum for 'b'")
 
 
+@pytest.mark.parametrize(
+    ["full_set", "items", "expected"],
+    [
+        pytest.param({}, None, set(), id="none"),
+        pytest.param(
+            {"a": {"b"}, "b": {"c", "d"}, "c": set(), "d": {"e"}, "e": set()},
+            {"b", "c"},
+            {"b", "c", "d", "e"},
+            id="chain",
+        ),
+        pytest.param({"a": {"b"}, "b": {"a", "c"}, "c": {"c"}}, {"a"}, {"a", "b", "c"}, id="circular"),
+    ]
+)
+def test_unroll(full_set: dict[str, set[str]], items: set[str], expected: set[str]) -> None:
+    assert expected == unroll(full_set, items)
+
+
+def test_unroll_expands_once() -> None:
+    class CountingDict(dict):
+        lookups = 0
+
+        def get(self, key, default=None):
+            CountingDict.lookups += 1
+            return super().get(key, default)
+
+    # every name references every other name (and itself), so re-visits would blow up
+    names = {f"m{i}" for i in range(200)}
+    full_set = CountingDict({name: set(names) for name in names})
+    items = {"m0"}
+    assert names == unroll(full_set, items)
+    assert len(names) == CountingDict.lookups
+    assert {"m0"} == items
+
+
 def test_model_references() -> None:
     oas = open_test_oas("pet2.yaml")
     models = map_models(oas.get(OasField.COMPONENTS, {}))
@@ -190,6 +336,28 @@ def test_model_references() -> None:
     assert expected == model_references(models)
 
 
+def test_reverse_references() -> None:
+    references = {"a": {"b", "c"}, "b": {"c"}, "c": set(), "d": {"a"}}
+    assert {"a": {"d"}, "b": {"a"}, "c": {"a", "b"}} == reverse_references(references)
+    assert {} == reverse_references({})
+
+
+def test_unroll_models() -> None:
+    oas = open_test_oas("ct.yaml")
+    models = map_models(oas.get(OasField.COMPONENTS, {}))
+    references = model_references(models)
+    for name in models:
+        assert unroll(references, {name}) == unroll_models(models, {name})
+
+    # only the reachable models are walked
+    with mock.patch("openapi_spec_tools.utils.find_references", wraps=find_references) as mock_find:
+        assert {"schemas/Pets", "schemas/Pet", "missing"} == unroll_models(
+            map_models(open_test_oas("pet2.yaml").get(OasField.COMPONENTS, {})),
+            {"schemas/Pets", "missing"},
+        )
+    assert 2 == mock_find.call_count
+
+
 @pytest.mark.parametrize(
     ["asset", "model_name", "keys"],
     [
@@ -256,6 +424,127 @@ def test_map_models() -> None:
     assert expected.issubset(keys)
 
 
+@pytest.mark.parametrize("loader", [yaml.SafeLoader, getattr(yaml, "CSafeLoader", yaml.SafeLoader)])
+def test_open_oas_section(tmp_path, loader) -> None:
+    expected = {"version": "1.0.0", "title": "Swagger Petstore", "license": {"name": "MIT"}}
+    with (
+        mock.patch("openapi_spec_tools._yaml.YamlLoader", loader),
+        mock.patch("openapi_spec_tools.utils.open_oas") as mock_open,
+    ):
+        assert expected == open_oas_section(asset_filename("pet2.yaml"), "info")
+        assert open_oas_section(asset_filename("pet2.yaml"), "webhooks") is None
+        assert {} == open_oas_section(asset_filename("pet2.yaml"), "webhooks", {})
+    mock_open.assert_not_called()
+
+    # JSON files are just loaded
+    assert expected == open_oas_section(asset_filename("pet2.json"), "info")
+
+    # alias to an anchor outside the section falls back to loading everything
+    alias_file = tmp_path / "alias.yaml"
+    alias_file.write_text("x-common: &common {title: Aliased}\ninfo: *common\n")
+    assert {"title": "Aliased"} == open_oas_section(str(alias_file), "info")
+
+    # not a mapping at the top
+    list_file = tmp_path / "list.yaml"
+    list_file.write_text("- info\n")
+    assert open_oas_section(str(list_file), "info") is None
+
+    with pytest.raises(FileNotFoundError):
+        open_oas_section("no-such-file", "info")
+
+
+@pytest.mark.parametrize(
+    ["text", "expected"],
+    [
+        pytest.param("info: {title: First}\ninfo: {title: Last}\n", {"title": "Last"}, id="duplicate"),
+        pytest.param("<<: {info: {title: Merged}}\npaths: {}\n", {"title": "Merged"}, id="merge"),
+        pytest.param("paths: {}\n<<: {info: {title: Merged}}\n", {"title": "Merged"}, id="merge-after"),
+    ]
+)
+def test_open_oas_section_fallback(tmp_path, text, expected) -> None:
+    # the section alone would be different from the full load, so the full specification is loaded
+    filename = tmp_path / "spec.yaml"
+    filename.write_text(text)
+    with mock.patch("openapi_spec_tools.utils.open_oas", wraps=open_oas) as mock_open:
+        assert expected == open_oas_section(str(filename), "info")
+    mock_open.assert_called_once()
+
+
+def test_open_oas_section_multiple_documents(tmp_path) -> None:
+    # loading the full specification fails with multiple documents, so the section does too
+    filename = tmp_path / "spec.yaml"
+    filename.write_text("info: {title: One}\n---\ninfo: {title: Two}\n")
+    with pytest.raises(yaml.YAMLError):
+        open_oas(str(filename))
+    with pytest.raises(yaml.YAMLError):
+        open_oas_section(str(filename), "info")
+
+
+def test_clone_data() -> None:
+    original = {"a": [1, {"b": "c"}, None], "d": {"e": 2.5, "f": True}}
+    result = clone_data(original)
+    assert result == original
+    assert result is not original
+    assert result["a"] is not original["a"]
+    assert result["a"][1] is not original["a"][1]
+    assert result["d"] is not original["d"]
+
+    result["a"][1]["b"] = "changed"
+    assert original["a"][1]["b"] == "c"
+
+    oas = open_test_oas("pet2.yaml")
+    assert clone_data(oas) == oas
+
+
+def test_map_tags() -> None:
+    oas = open_test_oas("pet2.yaml")
+    tags = map_tags(oas.get(OasField.PATHS))
+    assert tags == {"pets": ["listPets", "createPets", "showPetById"], "admin": ["deletePetById"]}
+
+    # untagged operations, and path parameters are skipped
+    paths = {
+        "/foo": {
+            "parameters": [{"name": "fooId", "in": "path"}],
+            "get": {"operationId": "getFoo"},
+            "put": {"operationId": "putFoo", "tags": None},
+            "post": {"operationId": "createFoo", "tags": ["foo", "bar"]},
+        },
+    }
+    assert map_tags(paths) == {"foo": ["createFoo"], "bar": ["createFoo"]}
+    assert map_tags({}) == {}
+
+
+def test_map_operations_non_destructive() -> None:
+    oas = open_test_oas("pet2.yaml")
+    paths = oas.get(OasField.PATHS)
+    operations = map_operations(paths)
+
+    # the x- fields are only added to the copies
+    assert operations["listPets"][OasField.X_METHOD] == "get"
+    assert OasField.X_METHOD not in paths["/pets"]["get"]
+    assert paths == open_test_oas("pet2.yaml").get(OasField.PATHS)
+
+    operations["listPets"][OasField.TAGS].append("changed")
+    assert paths["/pets"]["get"][OasField.TAGS] == ["pets"]
+
+
+def test_path_item_fields() -> None:
+    # path items can have fields that are not operations
+    paths = {
+        "/foo": {
+            "summary": "Foo things",
+            "servers": [{"url": "https://foo.example.com"}],
+            "x-internal": True,
+            "parameters": [{"name": "fooId", "in": "path"}],
+            "get": {"operationId": "getFoo", "tags": ["foo"]},
+        },
+    }
+    operations = map_operations(paths)
+    assert operations.keys() == {"getFoo"}
+    assert operations["getFoo"][OasField.X_PATH_PARAMS] == [{"name": "fooId", "in": "path"}]
+    assert map_tags(paths) == {"foo": ["getFoo"]}
+
+
 def test_map_operations() -> None:
     oas = open_test_oas("pet2.yaml")
     ops = map_operations(oas.get(OasField.PATHS))
@@ -428,9 +717,30 @@ def test_set_nullable_not_required(filename: str, expected: dict[str, Any]) -> N
     assert diff == expected
 
 
+def test_update_copies() -> None:
+    orig = open_test_oas("pet2.yaml")
+    pet = orig[OasField.COMPONENTS][OasField.SCHEMAS]["Pet"]
+    pet[OasField.PROPS]["owner"][OasField.NULLABLE.value] = True
+
+    # only the modified parts are copied, the rest is shared with the original
+    untagged = remove_schema_tags(orig)
+    assert orig[OasField.COMPONENTS] is untagged[OasField.COMPONENTS]
+    get_op = orig[OasField.PATHS]["/pets"]["get"]
+    assert get_op[OasField.TAGS] == ["pets"]
+    assert get_op[OasField.RESPONSES] is untagged[OasField.PATHS]["/pets"]["get"][OasField.RESPONSES]
+
+    updated = set_nullable_not_required(orig)
+    assert orig[OasField.PATHS] is updated[OasField.PATHS]
+    updated_pet = updated[OasField.COMPONENTS][OasField.SCHEMAS]["Pet"]
+    assert pet[OasField.PROPS] is updated_pet[OasField.PROPS]
+    assert ["id", "name"] == updated_pet[OasField.REQUIRED]
+    assert ["id", "name", "owner"] == pet[OasField.REQUIRED]
+
+
 def test_schema_operations_filter_remove() -> None:
     original = open_test_oas("pet2.yaml")
     updated = schema_operations_filter(original, remove={"deletePetById"})
+    assert original == open_test_oas("pet2.yaml")  # non-destructive
 
     diff = find_diffs(original, updated)
     assert diff == {
@@ -475,6 +785,55 @@ def test_schema_operations_filter_allow() -> None:
     }
 
 
+def test_schema_operations_filter_untagged() -> None:
+    original = open_test_oas("pet2.yaml")
+    original[OasField.PATHS]["/pets/{petId}"]["delete"][OasField.TAGS.value] = None
+    updated = schema_operations_filter(original, allow={"deletePetById"})
+
+    # the only operation left is untagged, so all the top-level tags are removed
+    assert OasField.TAGS not in updated
+    assert list(updated[OasField.PATHS]) == ["/pets/{petId}"]
+
+
+def test_schema_operations_filter_path_fields() -> None:
+    original = open_test_oas("pet2.yaml")
+    path_fields = {
+        "summary": "Single pet",
+        "description": "Operations on a pet",
+        "servers": [{"url": "https://pets.example.com"}],
+        "x-internal": True,
+    }
+    original[OasField.PATHS]["/pets/{petId}"].update(path_fields)
+    updated = schema_operations_filter(original, remove={"deletePetById"})
+
+    # the non-operation path fields are kept along with the path parameters
+    path_data = updated[OasField.PATHS]["/pets/{petId}"]
+    assert path_fields == {k: v for k, v in path_data.items() if k in path_fields}
+    assert OasField.PARAMS.value in path_data
+    assert "delete" not in path_data
+
+    # removing all the operations on a path still removes the path
+    updated = schema_operations_filter(original, allow={"listPets"})
+    assert ["/pets"] == list(updated[OasField.PATHS])
+
+
+def test_schema_operations_filter_copies() -> None:
+    original = open_test_oas("pet2.yaml")
+    removed = original[OasField.PATHS]["/pets"]["get"]
+    with mock.patch("openapi_spec_tools.utils.clone_data", wraps=clone_data) as mock_clone:
+        updated = schema_operations_filter(original, remove={"listPets"})
+
+    # removed operations are never copied
+    assert all(c.args[0] is not removed for c in mock_clone.call_args_list)
+
+    # the kept operations and path parameters are copies
+    path_data = updated[OasField.PATHS]["/pets/{petId}"]
+    assert path_data == {k: v for k, v in original[OasField.PATHS]["/pets/{petId}"].items() if k in path_data}
+    path_data[OasField.PARAMS.value][0].clear()
+    path_data["get"].clear()
+    assert original == open_test_oas("pet2.yaml")
+
+
 def test_map_content_types():
     schema = open_test_oas("pet2.yaml")
     result = map_content_types(schema)
@@ -507,3 +866,7 @@ def test_remove_property():
         "h": None,
     }
     assert expected == remove_property(original, "d")
+
+    # non-destructive
+    assert original["c"] == {"d": "e"}
+    assert original["f"][2] == {"d": 1}